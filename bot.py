@@ -5,20 +5,60 @@ Comprehensive bot with 15+ slash commands for managing football clubs
 """
 
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 import asyncio
 import os
 import logging
 import json
-from datetime import datetime, timedelta
+import functools
+import re
+from datetime import datetime, timezone
 from database import Database
 import aiohttp
-from typing import Optional
+from typing import Dict, Optional, Set
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import time
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+def _parse_dt(value: str) -> datetime:
+    """Parse a stored 'YYYY-MM-DD HH:MM:SS' timestamp using the C ISO parser"""
+    return datetime.fromisoformat(value)
+
+# Cheap shape check for user-supplied match dates before strptime
+_MATCH_DATETIME_RE = re.compile(r'^\d{4}-\d{1,2}-\d{1,2} \d{1,2}:\d{2}$')
+
+_RANK_MEDALS = {1: "🥇", 2: "🥈", 3: "🥉"}
+
+def _rank_label(rank: int) -> str:
+    """Medal for the top three ranks, otherwise the rank number"""
+    return _RANK_MEDALS.get(rank, f"{rank}.")
+
+# Formatter for every euro amount shown in embeds
+_fmt_eur = "€{:,.2f}".format
+
+# Match reminders go out 5 minutes before kick-off; one more than a minute
+# late is dropped rather than sent with a wrong countdown
+_REMINDER_LEAD = 300
+_REMINDER_GRACE = 60
+
+# Shared embed colours
+COLOR_GREEN = discord.Color.green()
+COLOR_RED = discord.Color.red()
+COLOR_GOLD = discord.Color.gold()
+COLOR_BLUE = discord.Color.blue()
+
+# Static embed shells, copied per command
+_TOP_PLAYERS_EMBED_TEMPLATE = discord.Embed(title="🏆 Top Players by Value", color=COLOR_GOLD)
+_BOT_INFO_EMBED_TEMPLATE = discord.Embed(
+    title="🤖 Football Club Bot Info",
+    description="Comprehensive football club management system",
+    color=COLOR_BLUE
+)
+_BOT_INFO_EMBED_TEMPLATE.set_footer(text="Created with ❤️ for football management")
+
 # Bot configuration
 intents = discord.Intents.default()
 intents.message_content = True
@@ -32,25 +72,55 @@ class FootballBot(commands.Bot):
             intents=intents,
             help_command=None
         )
-        self.db = Database()
-        self.rate_limit_delay = 1.0  # Base delay between API calls
-        self.max_retries = 3
-        self.last_request_time = 0
+        # Opened in setup_hook, so importing this module (e.g. in a gunicorn
+        # master that later forks) never holds an SQLite connection
+        self.db: Optional[Database] = None
+        # SQLite allows one writer at a time, so a single worker avoids lock contention
+        self.db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db')
+        self.dm_sem = asyncio.Semaphore(15)  # Cap concurrent DM sends
+        self.reminder_jobs = {}  # match_id -> (guild_id, reminder task)
+        self.background_tasks = set()  # Strong refs to fire-and-forget tasks
+        self.due_reminders = []  # Matches whose reminder is due, awaiting the batch send
+        self.reminder_flush: Optional[asyncio.Task] = None
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        # role_id -> ids of the members holding it; Role.members scans the whole guild
+        self.role_members: Dict[int, Set[int]] = defaultdict(set)
         
     async def setup_hook(self):
         """Setup hook called when bot is ready"""
         logger.info("Bot setup hook called")
+        
+        # Shared connection pool for outbound HTTP requests; a restarted
+        # start() runs this hook again, so reuse the session if it's still open
+        if self.http_session is None or self.http_session.closed:
+            self.http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, limit_per_host=10, ttl_dns_cache=300)
+            )
+        
         await self.tree.sync()
         logger.info("Commands synced")
         
-        # Start background tasks
-        if not self.match_reminder.is_running():
-            self.match_reminder.start()
+        # Open the database on its own thread before anything queries it; a
+        # restarted start() runs this hook again but keeps the connection
+        if self.db is None:
+            self.db = await self.run_db(Database)
+        
+        # Schedule reminders for matches already in the database
+        await self.schedule_pending_reminders()
+        
+    async def close(self):
+        """Close the shared HTTP session, database and its thread before shutting down"""
+        if self.http_session and not self.http_session.closed:
+            await self.http_session.close()
+        await super().close()
+        if self.db:
+            await self.run_db(self.db.close)
+        self.db_executor.shutdown(wait=False)
         
     async def on_ready(self):
         """Called when bot is ready"""
-        logger.info(f'{self.user} has connected to Discord!')
-        logger.info(f'Bot is in {len(self.guilds)} guilds')
+        logger.info('%s has connected to Discord!', self.user)
+        logger.info('Bot is in %d guilds', len(self.guilds))
         
         # Set bot status
         activity = discord.Activity(
@@ -59,6 +129,37 @@ class FootballBot(commands.Bot):
         )
         await self.change_presence(activity=activity)
         
+        # Member caches are complete once ready (and again after a reconnect)
+        self.role_members.clear()
+        for guild in self.guilds:
+            self.index_guild_roles(guild)
+        
+    async def on_guild_join(self, guild):
+        self.index_guild_roles(guild)
+        
+    async def on_guild_remove(self, guild):
+        for role in guild.roles:
+            self.role_members.pop(role.id, None)
+        
+    async def on_guild_role_delete(self, role):
+        self.role_members.pop(role.id, None)
+        
+    async def on_member_join(self, member):
+        self._index_member_roles(member)
+        
+    async def on_member_remove(self, member):
+        for role in member.roles:
+            self.role_members[role.id].discard(member.id)
+        
+    async def on_member_update(self, before, after):
+        """Keep the role index in step with role changes"""
+        before_roles = {role.id for role in before.roles}
+        after_roles = {role.id for role in after.roles}
+        for role_id in before_roles - after_roles:
+            self.role_members[role_id].discard(after.id)
+        for role_id in after_roles - before_roles:
+            self.role_members[role_id].add(after.id)
+        
     async def on_command_error(self, ctx, error):
         """Handle command errors"""
         if isinstance(error, commands.MissingPermissions):
@@ -66,85 +167,215 @@ class FootballBot(commands.Bot):
         elif isinstance(error, commands.CommandOnCooldown):
             await ctx.respond(f"⏰ Command on cooldown. Try again in {error.retry_after:.2f} seconds.", ephemeral=True)
         else:
-            logger.error(f"Command error: {error}")
+            logger.error("Command error: %s", error)
             await ctx.respond("❌ An error occurred while processing your command.", ephemeral=True)
     
-    async def rate_limit_handler(self):
-        """Handle rate limiting to prevent 429 errors"""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
+    async def _dm(self, member, embed):
+        """Send an embed to a member via DM, bounded by the DM semaphore"""
+        async with self.dm_sem:
+            try:
+                await member.send(embed=embed)
+            except discord.HTTPException:
+                pass  # User has DMs disabled
+    
+    def _index_member_roles(self, member):
+        # @everyone would just mirror the whole member list, so leave it out
+        for role in member.roles:
+            if not role.is_default():
+                self.role_members[role.id].add(member.id)
+    
+    def index_guild_roles(self, guild):
+        """Record which members hold each role in a guild"""
+        for member in guild.members:
+            self._index_member_roles(member)
+    
+    def team_members(self, *roles):
+        """Collect the unique members holding any of the given roles"""
+        recipients = {}
+        for role in roles:
+            for member_id in self.role_members.get(role.id, ()):
+                member = role.guild.get_member(member_id)
+                if member is not None:
+                    recipients[member_id] = member
+        return list(recipients.values())
+    
+    async def dm_members(self, members, embed):
+        """Send an embed to the given members concurrently"""
+        await asyncio.gather(
+            *[self._dm(member, embed) for member in members],
+            return_exceptions=True
+        )
+    
+    async def run_db(self, fn, *args, **kwargs):
+        """Run a blocking database call on the dedicated database thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.db_executor, functools.partial(fn, *args, **kwargs))
+    
+    def notify_members(self, members, embed):
+        """Fan out DMs in the background so the caller is not blocked"""
+        task = asyncio.create_task(self.dm_members(members, embed))
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+    
+    def schedule_match_reminder(self, match):
+        """Schedule a one-shot reminder 5 minutes before a match starts"""
+        if match['reminder_sent']:
+            return
         
-        if elapsed < self.rate_limit_delay:
-            await asyncio.sleep(self.rate_limit_delay - elapsed)
+        # Skip matches already inside their last 4 minutes
+        remind_at = match['ts'] - _REMINDER_LEAD
+        if remind_at + _REMINDER_GRACE <= time.time():
+            return
         
-        self.last_request_time = time.time()
+        self.cancel_match_reminder(match['id'])
+        self.reminder_jobs[match['id']] = (
+            match['guild_id'],
+            asyncio.create_task(self._run_match_reminder(match, remind_at))
+        )
     
-    @tasks.loop(minutes=1)
-    async def match_reminder(self):
-        """Check for upcoming matches and send reminders"""
-        try:
-            upcoming_matches = self.db.get_upcoming_matches()
-            current_time = datetime.now()
-            
-            for match in upcoming_matches:
-                match_time = datetime.strptime(match['datetime'], '%Y-%m-%d %H:%M')
-                time_diff = (match_time - current_time).total_seconds() / 60
-                
-                # Send reminder 5 minutes before match
-                if 4 <= time_diff <= 6 and not match['reminder_sent']:
-                    await self.send_match_reminder(match)
-                    self.db.mark_reminder_sent(match['id'])
-                    
-        except Exception as e:
-            logger.error(f"Error in match reminder task: {e}")
+    def cancel_match_reminder(self, match_id: int):
+        """Cancel a pending match reminder"""
+        job = self.reminder_jobs.pop(match_id, None)
+        if job:
+            job[1].cancel()
     
-    async def send_match_reminder(self, match):
-        """Send match reminder to teams"""
+    def cancel_guild_reminders(self, guild_id: int):
+        """Cancel all pending match reminders for a guild"""
+        for match_id, (job_guild_id, _) in list(self.reminder_jobs.items()):
+            if job_guild_id == guild_id:
+                self.cancel_match_reminder(match_id)
+    
+    async def _run_match_reminder(self, match, remind_at: int):
+        """Wait until the reminder time, then hand the match to the reminder batch"""
         try:
-            guild = self.get_guild(match['guild_id'])
-            if not guild:
+            await self.wait_until_ready()
+            delay = remind_at - time.time()
+            # The reminder window may have passed while waiting for the gateway
+            if delay < -_REMINDER_GRACE:
                 return
+            await asyncio.sleep(max(delay, 0))
+            self._queue_due_reminder(match)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Error in match reminder task")
+        finally:
+            job = self.reminder_jobs.get(match['id'])
+            if job and job[1] is asyncio.current_task():
+                del self.reminder_jobs[match['id']]
+    
+    def _queue_due_reminder(self, match):
+        """Collect reminders that fire together so each member gets one DM"""
+        self.due_reminders.append(match)
+        if self.reminder_flush is None:
+            self.reminder_flush = asyncio.create_task(self._flush_due_reminders())
+    
+    async def _flush_due_reminders(self):
+        """Send and mark sent every reminder queued in the last second"""
+        await asyncio.sleep(1)  # Let matches due at the same moment join the batch
+        matches, self.due_reminders = self.due_reminders, []
+        self.reminder_flush = None
+        
+        try:
+            await self.send_match_reminders(matches)
+            await self.run_db(self.db.mark_reminders_sent, [match['id'] for match in matches])
+        except Exception:
+            logger.exception("Error in match reminder batch")
+    
+    async def schedule_pending_reminders(self):
+        """Schedule reminders for matches stored while the bot was offline"""
+        for match in await self.run_db(self.db.get_pending_reminders, int(time.time())):
+            self.schedule_match_reminder(match)
+    
+    @staticmethod
+    def _reminder_embed(fields):
+        """Build a reminder listing one (teams, time) field per match"""
+        embed = discord.Embed(
+            title="⚽ Match Reminder",
+            description="Your match starts in 5 minutes!" if len(fields) == 1
+            else f"You have {len(fields)} matches starting in 5 minutes!",
+            color=COLOR_RED,
+            timestamp=datetime.now(timezone.utc)
+        )
+        for teams, start in fields:
+            embed.add_field(name=teams, value=start, inline=False)
+        return embed
+    
+    async def send_match_reminders(self, matches):
+        """Send one reminder DM per team member covering all of their due matches"""
+        try:
+            fields_by_member = {}  # member_id -> (member, [(teams, time)])
+            for match in matches:
+                guild = self.get_guild(match['guild_id'])
+                if not guild:
+                    continue
+                    
+                team1 = guild.get_role(match['team1_id'])
+                team2 = guild.get_role(match['team2_id'])
+                if not (team1 and team2):
+                    continue
                 
-            team1 = guild.get_role(match['team1_id'])
-            team2 = guild.get_role(match['team2_id'])
+                field = (f"{team1.name} vs {team2.name}", f"<t:{match['ts']}:F>")
+                for member in self.team_members(team1, team2):
+                    fields_by_member.setdefault(member.id, (member, []))[1].append(field)
             
-            if team1 and team2:
-                embed = discord.Embed(
-                    title="⚽ Match Reminder",
-                    description=f"Your match starts in 5 minutes!",
-                    color=discord.Color.red(),
-                    timestamp=datetime.now()
-                )
-                embed.add_field(
-                    name="Teams",
-                    value=f"{team1.name} vs {team2.name}",
-                    inline=False
-                )
-                embed.add_field(
-                    name="Time",
-                    value=f"<t:{int(datetime.strptime(match['datetime'], '%Y-%m-%d %H:%M').timestamp())}:F>",
-                    inline=False
-                )
-                
-                # Send to team members via DM
-                for member in team1.members:
-                    try:
-                        await member.send(embed=embed)
-                    except:
-                        pass  # User has DMs disabled
-                        
-                for member in team2.members:
-                    try:
-                        await member.send(embed=embed)
-                    except:
-                        pass  # User has DMs disabled
+            # Members due for the same matches share one embed
+            members_by_fields = {}
+            for member, fields in fields_by_member.values():
+                members_by_fields.setdefault(tuple(fields), []).append(member)
+            
+            # Send to team members via DM
+            await asyncio.gather(*[
+                self.dm_members(members, self._reminder_embed(fields))
+                for fields, members in members_by_fields.items()
+            ])
                         
-        except Exception as e:
-            logger.error(f"Error sending match reminder: {e}")
+        except Exception:
+            logger.exception("Error sending match reminders")
 
 # Initialize bot
 bot = FootballBot()
 
+async def send_private(interaction: discord.Interaction, message: str):
+    """Reply with a message only the invoking user can see
+    
+    After a public defer Discord shows the first followup like the deferred
+    response and ignores `ephemeral`, so the "thinking..." placeholder is
+    deleted first and the message goes out as a fresh ephemeral followup.
+    """
+    if not interaction.response.is_done():
+        await interaction.response.send_message(message, ephemeral=True)
+        return
+    
+    try:
+        await interaction.delete_original_response()
+    except discord.HTTPException:
+        pass  # Placeholder already gone
+    await interaction.followup.send(message, ephemeral=True)
+
+def guarded(action: str):
+    """Wrap a slash command with the server-only check and error reply
+    
+    `action` completes "An error occurred while ..." for the user-facing
+    message and names the failure in the log.
+    """
+    error_message = f"❌ An error occurred while {action}."
+    
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(interaction: discord.Interaction, *args, **kwargs):
+            if not interaction.guild:
+                await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
+                return
+            
+            try:
+                await func(interaction, *args, **kwargs)
+            except Exception:
+                logger.exception("Error %s", action)
+                await send_private(interaction, error_message)
+        return wrapper
+    return decorator
+
 def is_admin():
     """Check if user has administrator permissions"""
     async def predicate(interaction: discord.Interaction):
@@ -152,8 +383,8 @@ def is_admin():
             await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
             return False
         
-        member = interaction.guild.get_member(interaction.user.id)
-        if not member or not member.guild_permissions.administrator:
+        # Permissions resolved by Discord in the interaction payload; no role iteration needed
+        if not interaction.permissions.administrator:
             await interaction.response.send_message("❌ Only administrators can use this command!", ephemeral=True)
             return False
         return True
@@ -167,92 +398,68 @@ def is_admin():
     budget="The club's budget in Euros"
 )
 @is_admin()
+@guarded("creating the club")
 async def create_club(interaction: discord.Interaction, name: str, budget: float):
     """Create a new football club"""
-    await bot.rate_limit_handler()
-    
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
-        return
+    await interaction.response.defer()
     
-    try:
-        success = bot.db.create_club(interaction.guild.id, name, budget)
-        if success:
-            embed = discord.Embed(
-                title="✅ Club Created",
-                description=f"**{name}** has been created successfully!",
-                color=discord.Color.green()
-            )
-            embed.add_field(name="Budget", value=f"€{budget:,.2f}", inline=True)
-            embed.set_footer(text=f"Created by {interaction.user.display_name}")
-            await interaction.response.send_message(embed=embed)
-        else:
-            await interaction.response.send_message("❌ Club already exists!", ephemeral=True)
-    except Exception as e:
-        logger.error(f"Error creating club: {e}")
-        await interaction.response.send_message("❌ An error occurred while creating the club.", ephemeral=True)
+    success = await bot.run_db(bot.db.create_club, interaction.guild.id, name, budget)
+    if success:
+        embed = discord.Embed(
+            title="✅ Club Created",
+            description=f"**{name}** has been created successfully!",
+            color=COLOR_GREEN
+        )
+        embed.add_field(name="Budget", value=_fmt_eur(budget), inline=True)
+        embed.set_footer(text=f"Created by {interaction.user.display_name}")
+        await interaction.followup.send(embed=embed)
+    else:
+        await send_private(interaction, "❌ Club already exists!")
 
 @bot.tree.command(name="delete_club", description="Delete a football club")
 @discord.app_commands.describe(name="The name of the club to delete")
 @is_admin()
+@guarded("deleting the club")
 async def delete_club(interaction: discord.Interaction, name: str):
     """Delete a football club"""
-    await bot.rate_limit_handler()
-    
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
-        return
+    await interaction.response.defer()
     
-    try:
-        success = bot.db.delete_club(interaction.guild.id, name)
-        if success:
-            embed = discord.Embed(
-                title="✅ Club Deleted",
-                description=f"**{name}** has been deleted successfully!",
-                color=discord.Color.red()
-            )
-            await interaction.response.send_message(embed=embed)
-        else:
-            await interaction.response.send_message("❌ Club not found!", ephemeral=True)
-    except Exception as e:
-        logger.error(f"Error deleting club: {e}")
-        await interaction.response.send_message("❌ An error occurred while deleting the club.", ephemeral=True)
+    success = await bot.run_db(bot.db.delete_club, interaction.guild.id, name)
+    if success:
+        embed = discord.Embed(
+            title="✅ Club Deleted",
+            description=f"**{name}** has been deleted successfully!",
+            color=COLOR_RED
+        )
+        await interaction.followup.send(embed=embed)
+    else:
+        await send_private(interaction, "❌ Club not found!")
 
 @bot.tree.command(name="list_clubs", description="List all football clubs")
+@guarded("fetching clubs")
 async def list_clubs(interaction: discord.Interaction):
     """List all football clubs"""
-    await bot.rate_limit_handler()
+    await interaction.response.defer()
     
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
-        return
+    clubs = await bot.run_db(bot.db.get_clubs_with_counts, interaction.guild.id)
     
-    try:
-        clubs = bot.db.get_clubs(interaction.guild.id)
+    if not clubs:
+        await send_private(interaction, "📋 No clubs found in this server.")
+        return
         
-        if not clubs:
-            await interaction.response.send_message("📋 No clubs found in this server.", ephemeral=True)
-            return
-            
-        embed = discord.Embed(
-            title="⚽ Football Clubs",
-            color=discord.Color.blue(),
-            timestamp=datetime.now()
-        )
+    embed = discord.Embed(
+        title="⚽ Football Clubs",
+        color=COLOR_BLUE,
+        timestamp=datetime.now(timezone.utc)
+    )
+    
+    embed.description = "\n".join(
+        f"🏆 **{club.name}** · 💰 {_fmt_eur(club.budget)} · 👥 {club.player_count} players"
+        for club in clubs[:10]  # Limit to 10 clubs
+    )
         
-        for club in clubs[:10]:  # Limit to 10 clubs
-            player_count = bot.db.get_player_count(club['id'])
-            embed.add_field(
-                name=f"🏆 {club['name']}",
-                value=f"💰 Budget: €{club['budget']:,.2f}\n👥 Players: {player_count}",
-                inline=True
-            )
-            
-        embed.set_footer(text=f"Total Clubs: {len(clubs)}")
-        await interaction.response.send_message(embed=embed)
-    except Exception as e:
-        logger.error(f"Error listing clubs: {e}")
-        await interaction.response.send_message("❌ An error occurred while fetching clubs.", ephemeral=True)
+    embed.set_footer(text=f"Total Clubs: {len(clubs)}")
+    await interaction.followup.send(embed=embed)
 
 @bot.tree.command(name="update_club_budget", description="Update a club's budget")
 @discord.app_commands.describe(
@@ -260,29 +467,22 @@ async def list_clubs(interaction: discord.Interaction):
     budget="The new budget in Euros"
 )
 @is_admin()
+@guarded("updating the budget")
 async def update_club_budget(interaction: discord.Interaction, name: str, budget: float):
     """Update a club's budget"""
-    await bot.rate_limit_handler()
-    
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
-        return
+    await interaction.response.defer()
     
-    try:
-        success = bot.db.update_club_budget(interaction.guild.id, name, budget)
-        if success:
-            embed = discord.Embed(
-                title="✅ Budget Updated",
-                description=f"**{name}**'s budget has been updated!",
-                color=discord.Color.green()
-            )
-            embed.add_field(name="New Budget", value=f"€{budget:,.2f}", inline=True)
-            await interaction.response.send_message(embed=embed)
-        else:
-            await interaction.response.send_message("❌ Club not found!", ephemeral=True)
-    except Exception as e:
-        logger.error(f"Error updating club budget: {e}")
-        await interaction.response.send_message("❌ An error occurred while updating the budget.", ephemeral=True)
+    success = await bot.run_db(bot.db.update_club_budget, interaction.guild.id, name, budget)
+    if success:
+        embed = discord.Embed(
+            title="✅ Budget Updated",
+            description=f"**{name}**'s budget has been updated!",
+            color=COLOR_GREEN
+        )
+        embed.add_field(name="New Budget", value=_fmt_eur(budget), inline=True)
+        await interaction.followup.send(embed=embed)
+    else:
+        await send_private(interaction, "❌ Club not found!")
 
 # Player Management Commands
 
@@ -295,57 +495,43 @@ async def update_club_budget(interaction: discord.Interaction, name: str, budget
     age="The player's age"
 )
 @is_admin()
+@guarded("adding the player")
 async def add_player(interaction: discord.Interaction, name: str, club: str, value: float, position: str = "Forward", age: int = 25):
     """Add a player to a club"""
-    await bot.rate_limit_handler()
+    await interaction.response.defer()
     
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
-        return
-    
-    try:
-        success = bot.db.add_player(interaction.guild.id, name, club, value, position, age)
-        if success:
-            embed = discord.Embed(
-                title="✅ Player Added",
-                description=f"**{name}** has been added to **{club}**!",
-                color=discord.Color.green()
-            )
-            embed.add_field(name="Value", value=f"€{value:,.2f}", inline=True)
-            embed.add_field(name="Position", value=position, inline=True)
-            embed.add_field(name="Age", value=f"{age} years", inline=True)
-            await interaction.response.send_message(embed=embed)
-        else:
-            await interaction.response.send_message("❌ Club not found or player already exists!", ephemeral=True)
-    except Exception as e:
-        logger.error(f"Error adding player: {e}")
-        await interaction.response.send_message("❌ An error occurred while adding the player.", ephemeral=True)
+    success = await bot.run_db(bot.db.add_player, interaction.guild.id, name, club, value, position, age)
+    if success:
+        embed = discord.Embed(
+            title="✅ Player Added",
+            description=f"**{name}** has been added to **{club}**!",
+            color=COLOR_GREEN
+        )
+        embed.add_field(name="Value", value=_fmt_eur(value), inline=True)
+        embed.add_field(name="Position", value=position, inline=True)
+        embed.add_field(name="Age", value=f"{age} years", inline=True)
+        await interaction.followup.send(embed=embed)
+    else:
+        await send_private(interaction, "❌ Club not found or player already exists!")
 
 @bot.tree.command(name="remove_player", description="Remove a player from their club")
 @discord.app_commands.describe(name="The player's name")
 @is_admin()
+@guarded("removing the player")
 async def remove_player(interaction: discord.Interaction, name: str):
     """Remove a player from their club"""
-    await bot.rate_limit_handler()
-    
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
-        return
+    await interaction.response.defer()
     
-    try:
-        success = bot.db.remove_player(interaction.guild.id, name)
-        if success:
-            embed = discord.Embed(
-                title="✅ Player Removed",
-                description=f"**{name}** has been removed!",
-                color=discord.Color.red()
-            )
-            await interaction.response.send_message(embed=embed)
-        else:
-            await interaction.response.send_message("❌ Player not found!", ephemeral=True)
-    except Exception as e:
-        logger.error(f"Error removing player: {e}")
-        await interaction.response.send_message("❌ An error occurred while removing the player.", ephemeral=True)
+    success = await bot.run_db(bot.db.remove_player, interaction.guild.id, name)
+    if success:
+        embed = discord.Embed(
+            title="✅ Player Removed",
+            description=f"**{name}** has been removed!",
+            color=COLOR_RED
+        )
+        await interaction.followup.send(embed=embed)
+    else:
+        await send_private(interaction, "❌ Player not found!")
 
 @bot.tree.command(name="update_player_value", description="Update a player's value")
 @discord.app_commands.describe(
@@ -353,29 +539,22 @@ async def remove_player(interaction: discord.Interaction, name: str):
     value="The new value in Euros"
 )
 @is_admin()
+@guarded("updating the player value")
 async def update_player_value(interaction: discord.Interaction, name: str, value: float):
     """Update a player's value"""
-    await bot.rate_limit_handler()
+    await interaction.response.defer()
     
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
-        return
-    
-    try:
-        success = bot.db.update_player_value(interaction.guild.id, name, value)
-        if success:
-            embed = discord.Embed(
-                title="✅ Player Value Updated",
-                description=f"**{name}**'s value has been updated!",
-                color=discord.Color.green()
-            )
-            embed.add_field(name="New Value", value=f"€{value:,.2f}", inline=True)
-            await interaction.response.send_message(embed=embed)
-        else:
-            await interaction.response.send_message("❌ Player not found!", ephemeral=True)
-    except Exception as e:
-        logger.error(f"Error updating player value: {e}")
-        await interaction.response.send_message("❌ An error occurred while updating the player value.", ephemeral=True)
+    success = await bot.run_db(bot.db.update_player_value, interaction.guild.id, name, value)
+    if success:
+        embed = discord.Embed(
+            title="✅ Player Value Updated",
+            description=f"**{name}**'s value has been updated!",
+            color=COLOR_GREEN
+        )
+        embed.add_field(name="New Value", value=_fmt_eur(value), inline=True)
+        await interaction.followup.send(embed=embed)
+    else:
+        await send_private(interaction, "❌ Player not found!")
 
 @bot.tree.command(name="transfer_player", description="Transfer a player between clubs")
 @discord.app_commands.describe(
@@ -385,77 +564,66 @@ async def update_player_value(interaction: discord.Interaction, name: str, value
     transfer_fee="The transfer fee in Euros"
 )
 @is_admin()
+@guarded("processing the transfer")
 async def transfer_player(interaction: discord.Interaction, player: str, from_club: str, to_club: str, transfer_fee: float):
     """Transfer a player between clubs"""
-    await bot.rate_limit_handler()
-    
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
-        return
-    
-    try:
-        success = bot.db.transfer_player(interaction.guild.id, player, from_club, to_club, transfer_fee)
-        if success:
-            embed = discord.Embed(
-                title="✅ Transfer Complete",
-                description=f"**{player}** has been transferred!",
-                color=discord.Color.gold()
-            )
-            embed.add_field(name="From", value=from_club, inline=True)
-            embed.add_field(name="To", value=to_club, inline=True)
-            embed.add_field(name="Transfer Fee", value=f"€{transfer_fee:,.2f}", inline=True)
-            
-            # Log transfer
-            bot.db.log_transfer(interaction.guild.id, player, from_club, to_club, transfer_fee, interaction.user.id)
-            
-            await interaction.response.send_message(embed=embed)
-        else:
-            await interaction.response.send_message("❌ Transfer failed! Check if clubs exist and have sufficient budget.", ephemeral=True)
-    except Exception as e:
-        logger.error(f"Error transferring player: {e}")
-        await interaction.response.send_message("❌ An error occurred during the transfer.", ephemeral=True)
+    await interaction.response.defer()
+    
+    success = await bot.run_db(
+        bot.db.transfer_and_log,
+        interaction.guild.id,
+        player,
+        from_club,
+        to_club,
+        transfer_fee,
+        interaction.user.id
+    )
+    if success:
+        embed = discord.Embed(
+            title="✅ Transfer Complete",
+            description=f"**{player}** has been transferred!",
+            color=COLOR_GOLD
+        )
+        embed.add_field(name="From", value=from_club, inline=True)
+        embed.add_field(name="To", value=to_club, inline=True)
+        embed.add_field(name="Transfer Fee", value=_fmt_eur(transfer_fee), inline=True)
+        
+        await interaction.followup.send(embed=embed)
+    else:
+        await send_private(interaction, "❌ Transfer failed! Check if clubs exist and have sufficient budget.")
 
 @bot.tree.command(name="list_players", description="List players in a club")
 @discord.app_commands.describe(club="The club name (optional)")
+@guarded("fetching players")
 async def list_players(interaction: discord.Interaction, club: str = ""):
     """List players in a club or all players"""
-    await bot.rate_limit_handler()
-    
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
+    await interaction.response.defer()
+    
+    if club and club.strip():
+        players = await bot.run_db(bot.db.get_club_players, interaction.guild.id, club)
+        total = len(players)
+        title = f"⚽ {club} Players"
+    else:
+        players, total = await bot.run_db(bot.db.preview_all_players, interaction.guild.id, 15)
+        title = "⚽ All Players"
+        
+    if not players:
+        await send_private(interaction, "📋 No players found.")
         return
+        
+    embed = discord.Embed(
+        title=title,
+        color=COLOR_BLUE,
+        timestamp=datetime.now(timezone.utc)
+    )
     
-    try:
-        if club and club.strip():
-            players = bot.db.get_club_players(interaction.guild.id, club)
-            title = f"⚽ {club} Players"
-        else:
-            players = bot.db.get_all_players(interaction.guild.id)
-            title = "⚽ All Players"
-            
-        if not players:
-            await interaction.response.send_message("📋 No players found.", ephemeral=True)
-            return
-            
-        embed = discord.Embed(
-            title=title,
-            color=discord.Color.blue(),
-            timestamp=datetime.now()
-        )
+    embed.description = "\n".join(
+        f"👤 **{player.name}** · 🏆 {player.club_name or 'Free Agent'} · 💰 {_fmt_eur(player.value)} · ⚽ {player.position} · 🎂 {player.age} years"
+        for player in players[:15]  # Limit to 15 players
+    )
         
-        for player in players[:15]:  # Limit to 15 players
-            club_name = player.get('club_name', 'Free Agent')
-            embed.add_field(
-                name=f"👤 {player['name']}",
-                value=f"🏆 {club_name}\n💰 €{player['value']:,.2f}\n⚽ {player['position']}\n🎂 {player['age']} years",
-                inline=True
-            )
-            
-        embed.set_footer(text=f"Total Players: {len(players)}")
-        await interaction.response.send_message(embed=embed)
-    except Exception as e:
-        logger.error(f"Error listing players: {e}")
-        await interaction.response.send_message("❌ An error occurred while fetching players.", ephemeral=True)
+    embed.set_footer(text=f"Total Players: {total}")
+    await interaction.followup.send(embed=embed)
 
 # Match Management Commands
 
@@ -468,338 +636,304 @@ async def list_players(interaction: discord.Interaction, club: str = ""):
     description="Match description"
 )
 @is_admin()
+@guarded("creating the match")
 async def create_match(interaction: discord.Interaction, team1: discord.Role, team2: discord.Role, date: str, time: str, description: str = "League Match"):
     """Create a match between two teams"""
-    await bot.rate_limit_handler()
-    
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
+    match_datetime = f"{date} {time}"
+    try:
+        if not _MATCH_DATETIME_RE.match(match_datetime):
+            raise ValueError(f"Invalid match datetime: {match_datetime}")
+        match_ts = int(datetime.strptime(match_datetime, '%Y-%m-%d %H:%M').timestamp())
+    except ValueError:
+        await interaction.response.send_message("❌ Invalid date/time format! Use YYYY-MM-DD for date and HH:MM for time.", ephemeral=True)
         return
     
-    try:
-        match_datetime = f"{date} {time}"
-        datetime.strptime(match_datetime, '%Y-%m-%d %H:%M')  # Validate format
-        
-        match_id = bot.db.create_match(
-            interaction.guild.id,
-            team1.id,
-            team2.id,
-            match_datetime,
-            description
+    # Discord only waits 3 seconds for the first response; the DB work and
+    # role lookups below may take longer, so acknowledge now and follow up
+    await interaction.response.defer()
+    
+    match_id = await bot.run_db(
+        bot.db.create_match,
+        interaction.guild.id,
+        team1.id,
+        team2.id,
+        match_ts,
+        description
+    )
+    
+    if match_id:
+        bot.schedule_match_reminder({
+            'id': match_id,
+            'guild_id': interaction.guild.id,
+            'team1_id': team1.id,
+            'team2_id': team2.id,
+            'ts': match_ts,
+            'description': description,
+            'reminder_sent': False
+        })
+        
+        embed = discord.Embed(
+            title="⚽ Match Created",
+            description=description,
+            color=COLOR_GREEN,
+            timestamp=datetime.now(timezone.utc)
         )
+        embed.add_field(name="Teams", value=f"{team1.mention} vs {team2.mention}", inline=False)
+        embed.add_field(name="Date & Time", value=f"<t:{match_ts}:F>", inline=False)
         
-        if match_id:
-            embed = discord.Embed(
-                title="⚽ Match Created",
-                description=description,
-                color=discord.Color.green(),
-                timestamp=datetime.now()
-            )
-            embed.add_field(name="Teams", value=f"{team1.mention} vs {team2.mention}", inline=False)
-            embed.add_field(name="Date & Time", value=f"<t:{int(datetime.strptime(match_datetime, '%Y-%m-%d %H:%M').timestamp())}:F>", inline=False)
-            
-            await interaction.response.send_message(embed=embed)
-            
-            # Send DM notifications to team members
-            notification_embed = discord.Embed(
-                title="📅 New Match Scheduled",
-                description=f"You have a match scheduled!",
-                color=discord.Color.blue()
-            )
-            
-            # Check if user is member and has roles
-            member = interaction.guild.get_member(interaction.user.id)
-            opponent = team2.name if member and team1 in member.roles else team1.name
-            notification_embed.add_field(name="Opponent", value=opponent, inline=False)
-            notification_embed.add_field(name="Date & Time", value=f"<t:{int(datetime.strptime(match_datetime, '%Y-%m-%d %H:%M').timestamp())}:F>", inline=False)
-            
-            for member in team1.members + team2.members:
-                try:
-                    await member.send(embed=notification_embed)
-                except:
-                    pass  # User has DMs disabled
-                    
-        else:
-            await interaction.response.send_message("❌ Failed to create match!", ephemeral=True)
-    except ValueError:
-        await interaction.response.send_message("❌ Invalid date/time format! Use YYYY-MM-DD for date and HH:MM for time.", ephemeral=True)
-    except Exception as e:
-        logger.error(f"Error creating match: {e}")
-        await interaction.response.send_message("❌ An error occurred while creating the match.", ephemeral=True)
+        await interaction.followup.send(embed=embed)
+        
+        # Send DM notifications to team members
+        notification_embed = discord.Embed(
+            title="📅 New Match Scheduled",
+            description=f"You have a match scheduled!",
+            color=COLOR_BLUE
+        )
+        
+        # Check if user is member and has roles
+        member = interaction.guild.get_member(interaction.user.id)
+        opponent = team2.name if member and team1 in member.roles else team1.name
+        notification_embed.add_field(name="Opponent", value=opponent, inline=False)
+        notification_embed.add_field(name="Date & Time", value=f"<t:{match_ts}:F>", inline=False)
+        
+        bot.notify_members(bot.team_members(team1, team2), notification_embed)
+                
+    else:
+        await send_private(interaction, "❌ Failed to create match!")
 
 @bot.tree.command(name="list_matches", description="List upcoming matches")
+@guarded("fetching matches")
 async def list_matches(interaction: discord.Interaction):
     """List upcoming matches"""
-    await bot.rate_limit_handler()
+    await interaction.response.defer()
     
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
-        return
+    matches = await bot.run_db(bot.db.get_upcoming_matches, interaction.guild.id)
     
-    try:
-        matches = bot.db.get_upcoming_matches(interaction.guild.id)
+    if not matches:
+        await send_private(interaction, "📋 No upcoming matches found.")
+        return
         
-        if not matches:
-            await interaction.response.send_message("📋 No upcoming matches found.", ephemeral=True)
-            return
-            
-        embed = discord.Embed(
-            title="📅 Upcoming Matches",
-            color=discord.Color.blue(),
-            timestamp=datetime.now()
-        )
+    embed = discord.Embed(
+        title="📅 Upcoming Matches",
+        color=COLOR_BLUE,
+        timestamp=datetime.now(timezone.utc)
+    )
+    
+    for match in matches[:10]:  # Limit to 10 matches
+        team1 = interaction.guild.get_role(match['team1_id'])
+        team2 = interaction.guild.get_role(match['team2_id'])
         
-        for match in matches[:10]:  # Limit to 10 matches
-            team1 = interaction.guild.get_role(match['team1_id'])
-            team2 = interaction.guild.get_role(match['team2_id'])
-            
-            if team1 and team2:
-                match_time = datetime.strptime(match['datetime'], '%Y-%m-%d %H:%M')
-                embed.add_field(
-                    name=f"⚽ {match['description']}",
-                    value=f"{team1.mention} vs {team2.mention}\n<t:{int(match_time.timestamp())}:F>",
-                    inline=False
-                )
-        
-        await interaction.response.send_message(embed=embed)
-    except Exception as e:
-        logger.error(f"Error listing matches: {e}")
-        await interaction.response.send_message("❌ An error occurred while fetching matches.", ephemeral=True)
+        if team1 and team2:
+            embed.add_field(
+                name=f"⚽ {match['description']}",
+                value=f"{team1.mention} vs {team2.mention}\n<t:{match['ts']}:F>",
+                inline=False
+            )
+    
+    await interaction.followup.send(embed=embed)
 
 # Statistics Commands
 
 @bot.tree.command(name="club_stats", description="Show detailed club statistics")
 @discord.app_commands.describe(name="The club name")
+@guarded("fetching club statistics")
 async def club_stats(interaction: discord.Interaction, name: str):
     """Show detailed club statistics"""
-    await bot.rate_limit_handler()
+    await interaction.response.defer()
     
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
-        return
+    club_data = await bot.run_db(bot.db.get_club_stats, interaction.guild.id, name)
     
-    try:
-        club_data = bot.db.get_club_stats(interaction.guild.id, name)
-        
-        if not club_data:
-            await interaction.response.send_message("❌ Club not found!", ephemeral=True)
-            return
-            
-        embed = discord.Embed(
-            title=f"📊 {name} Statistics",
-            color=discord.Color.gold(),
-            timestamp=datetime.now()
-        )
-        
-        embed.add_field(name="💰 Budget", value=f"€{club_data['budget']:,.2f}", inline=True)
-        embed.add_field(name="👥 Players", value=str(club_data['player_count']), inline=True)
-        embed.add_field(name="💎 Total Value", value=f"€{club_data['total_value']:,.2f}", inline=True)
-        embed.add_field(name="📈 Average Value", value=f"€{club_data['avg_value']:,.2f}", inline=True)
-        embed.add_field(name="🔝 Most Valuable", value=f"{club_data['most_valuable']} (€{club_data['highest_value']:,.2f})", inline=True)
-        embed.add_field(name="🔄 Transfers", value=f"In: {club_data['transfers_in']} | Out: {club_data['transfers_out']}", inline=True)
+    if not club_data:
+        await send_private(interaction, "❌ Club not found!")
+        return
         
-        await interaction.response.send_message(embed=embed)
-    except Exception as e:
-        logger.error(f"Error getting club stats: {e}")
-        await interaction.response.send_message("❌ An error occurred while fetching club statistics.", ephemeral=True)
+    embed = discord.Embed(
+        title=f"📊 {name} Statistics",
+        color=COLOR_GOLD,
+        timestamp=datetime.now(timezone.utc)
+    )
+    
+    embed.add_field(name="💰 Budget", value=_fmt_eur(club_data['budget']), inline=True)
+    embed.add_field(name="👥 Players", value=str(club_data['player_count']), inline=True)
+    embed.add_field(name="💎 Total Value", value=_fmt_eur(club_data['total_value']), inline=True)
+    embed.add_field(name="📈 Average Value", value=_fmt_eur(club_data['avg_value']), inline=True)
+    embed.add_field(name="🔝 Most Valuable", value=f"{club_data['most_valuable']} ({_fmt_eur(club_data['highest_value'])})", inline=True)
+    embed.add_field(name="🔄 Transfers", value=f"In: {club_data['transfers_in']} | Out: {club_data['transfers_out']}", inline=True)
+    
+    await interaction.followup.send(embed=embed)
 
 @bot.tree.command(name="top_players", description="Show top players by value")
+@guarded("fetching top players")
 async def top_players(interaction: discord.Interaction):
     """Show top players by value"""
-    await bot.rate_limit_handler()
+    await interaction.response.defer()
     
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
-        return
+    players = await bot.run_db(bot.db.get_top_players, interaction.guild.id, limit=10)
     
-    try:
-        players = bot.db.get_top_players(interaction.guild.id, limit=10)
-        
-        if not players:
-            await interaction.response.send_message("📋 No players found.", ephemeral=True)
-            return
-            
-        embed = discord.Embed(
-            title="🏆 Top Players by Value",
-            color=discord.Color.gold(),
-            timestamp=datetime.now()
-        )
-        
-        for i, player in enumerate(players, 1):
-            medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-            embed.add_field(
-                name=f"{medal} {player['name']}",
-                value=f"🏆 {player['club_name']}\n💰 €{player['value']:,.2f}\n⚽ {player['position']}",
-                inline=True
-            )
+    if not players:
+        await send_private(interaction, "📋 No players found.")
+        return
         
-        await interaction.response.send_message(embed=embed)
-    except Exception as e:
-        logger.error(f"Error getting top players: {e}")
-        await interaction.response.send_message("❌ An error occurred while fetching top players.", ephemeral=True)
+    embed = _TOP_PLAYERS_EMBED_TEMPLATE.copy()
+    embed.timestamp = datetime.now(timezone.utc)
+    
+    embed.description = "\n".join(
+        f"{_rank_label(i)} **{player.name}** · 🏆 {player.club_name or 'Free Agent'} · 💰 {_fmt_eur(player.value)} · ⚽ {player.position}"
+        for i, player in enumerate(players, 1)
+    )
+    
+    await interaction.followup.send(embed=embed)
 
 @bot.tree.command(name="richest_clubs", description="Show clubs with highest budgets")
+@guarded("fetching richest clubs")
 async def richest_clubs(interaction: discord.Interaction):
     """Show clubs with highest budgets"""
-    await bot.rate_limit_handler()
+    await interaction.response.defer()
     
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
-        return
+    clubs = await bot.run_db(bot.db.get_richest_clubs, interaction.guild.id, limit=10)
     
-    try:
-        clubs = bot.db.get_richest_clubs(interaction.guild.id, limit=10)
-        
-        if not clubs:
-            await interaction.response.send_message("📋 No clubs found.", ephemeral=True)
-            return
-            
-        embed = discord.Embed(
-            title="💰 Richest Clubs",
-            color=discord.Color.gold(),
-            timestamp=datetime.now()
-        )
-        
-        for i, club in enumerate(clubs, 1):
-            medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-            embed.add_field(
-                name=f"{medal} {club['name']}",
-                value=f"💰 €{club['budget']:,.2f}\n👥 {club['player_count']} players",
-                inline=True
-            )
+    if not clubs:
+        await send_private(interaction, "📋 No clubs found.")
+        return
         
-        await interaction.response.send_message(embed=embed)
-    except Exception as e:
-        logger.error(f"Error getting richest clubs: {e}")
-        await interaction.response.send_message("❌ An error occurred while fetching richest clubs.", ephemeral=True)
+    embed = discord.Embed(
+        title="💰 Richest Clubs",
+        color=COLOR_GOLD,
+        timestamp=datetime.now(timezone.utc)
+    )
+    
+    embed.description = "\n".join(
+        f"{_rank_label(i)} **{club.name}** · 💰 {_fmt_eur(club.budget)} · 👥 {club.player_count} players"
+        for i, club in enumerate(clubs, 1)
+    )
+    
+    await interaction.followup.send(embed=embed)
 
 @bot.tree.command(name="transfer_history", description="Show recent transfer history")
+@guarded("fetching transfer history")
 async def transfer_history(interaction: discord.Interaction):
     """Show recent transfer history"""
-    await bot.rate_limit_handler()
+    await interaction.response.defer()
     
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
-        return
+    transfers = await bot.run_db(bot.db.get_transfer_history, interaction.guild.id, limit=10)
     
-    try:
-        transfers = bot.db.get_transfer_history(interaction.guild.id, limit=10)
+    if not transfers:
+        await send_private(interaction, "📋 No transfers found.")
+        return
         
-        if not transfers:
-            await interaction.response.send_message("📋 No transfers found.", ephemeral=True)
+    embed = discord.Embed(
+        title="🔄 Recent Transfers",
+        color=COLOR_BLUE,
+        timestamp=datetime.now(timezone.utc)
+    )
+    
+    embed.description = "\n".join(
+        f"👤 **{transfer['player_name']}** · 📤 {transfer['from_club']} ➡️ {transfer['to_club']} · "
+        f"💰 {_fmt_eur(transfer['fee'])} · 📅 <t:{int(_parse_dt(transfer['date']).timestamp())}:R>"
+        for transfer in transfers
+    )
+    
+    await interaction.followup.send(embed=embed)
+
+# Utility Commands
+
+class ConfirmView(discord.ui.View):
+    """Confirm/cancel buttons for reset_data, usable only by the invoking admin"""
+    
+    def __init__(self, owner_id: int, guild_id: Optional[int]):
+        super().__init__(timeout=30)
+        self.owner_id = owner_id
+        self.guild_id = guild_id
+        
+    @discord.ui.button(label="CONFIRM RESET", style=discord.ButtonStyle.danger)
+    async def confirm_reset(self, button_interaction: discord.Interaction, button: discord.ui.Button):
+        if button_interaction.user.id != self.owner_id:
+            await button_interaction.response.send_message("❌ Only the command user can confirm this action!", ephemeral=True)
             return
             
-        embed = discord.Embed(
-            title="🔄 Recent Transfers",
-            color=discord.Color.blue(),
-            timestamp=datetime.now()
-        )
-        
-        for transfer in transfers:
-            transfer_date = datetime.strptime(transfer['date'], '%Y-%m-%d %H:%M:%S')
-            embed.add_field(
-                name=f"👤 {transfer['player_name']}",
-                value=f"📤 {transfer['from_club']} ➡️ {transfer['to_club']}\n💰 €{transfer['fee']:,.2f}\n📅 <t:{int(transfer_date.timestamp())}:R>",
-                inline=False
+        if self.guild_id is None:
+            await button_interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
+            return
+            
+        try:
+            await bot.run_db(bot.db.reset_all_data, self.guild_id)
+            bot.cancel_guild_reminders(self.guild_id)
+            
+            success_embed = discord.Embed(
+                title="✅ Data Reset Complete",
+                description="All bot data has been permanently deleted.",
+                color=COLOR_GREEN
             )
-        
-        await interaction.response.send_message(embed=embed)
-    except Exception as e:
-        logger.error(f"Error getting transfer history: {e}")
-        await interaction.response.send_message("❌ An error occurred while fetching transfer history.", ephemeral=True)
-
-# Utility Commands
+            await button_interaction.response.edit_message(embed=success_embed, view=None)
+        except Exception:
+            logger.exception("Error resetting data")
+            await button_interaction.response.send_message("❌ An error occurred while resetting data.", ephemeral=True)
+            
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
+    async def cancel_reset(self, button_interaction: discord.Interaction, button: discord.ui.Button):
+        if button_interaction.user.id != self.owner_id:
+            await button_interaction.response.send_message("❌ Only the command user can cancel this action!", ephemeral=True)
+            return
+            
+        cancel_embed = discord.Embed(
+            title="✅ Reset Cancelled",
+            description="Data reset has been cancelled. Your data is safe.",
+            color=COLOR_GREEN
+        )
+        await button_interaction.response.edit_message(embed=cancel_embed, view=None)
 
 @bot.tree.command(name="reset_data", description="Reset all bot data (USE WITH CAUTION)")
 @is_admin()
 async def reset_data(interaction: discord.Interaction):
     """Reset all bot data"""
-    await bot.rate_limit_handler()
     
     # Confirmation embed
     embed = discord.Embed(
         title="⚠️ DANGER: Reset All Data",
         description="This will permanently delete ALL clubs, players, matches, and transfer history!\n\n**This action cannot be undone!**",
-        color=discord.Color.red()
+        color=COLOR_RED
     )
     
-    # Create confirmation view
-    class ConfirmView(discord.ui.View):
-        def __init__(self):
-            super().__init__(timeout=30)
-            
-        @discord.ui.button(label="CONFIRM RESET", style=discord.ButtonStyle.danger)
-        async def confirm_reset(self, button_interaction: discord.Interaction, button: discord.ui.Button):
-            if button_interaction.user != interaction.user:
-                await button_interaction.response.send_message("❌ Only the command user can confirm this action!", ephemeral=True)
-                return
-                
-            if not interaction.guild:
-                await button_interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
-                return
-                
-            try:
-                bot.db.reset_all_data(interaction.guild.id)
-                
-                success_embed = discord.Embed(
-                    title="✅ Data Reset Complete",
-                    description="All bot data has been permanently deleted.",
-                    color=discord.Color.green()
-                )
-                await button_interaction.response.edit_message(embed=success_embed, view=None)
-            except Exception as e:
-                logger.error(f"Error resetting data: {e}")
-                await button_interaction.response.send_message("❌ An error occurred while resetting data.", ephemeral=True)
-                
-        @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
-        async def cancel_reset(self, button_interaction: discord.Interaction, button: discord.ui.Button):
-            if button_interaction.user != interaction.user:
-                await button_interaction.response.send_message("❌ Only the command user can cancel this action!", ephemeral=True)
-                return
-                
-            cancel_embed = discord.Embed(
-                title="✅ Reset Cancelled",
-                description="Data reset has been cancelled. Your data is safe.",
-                color=discord.Color.green()
-            )
-            await button_interaction.response.edit_message(embed=cancel_embed, view=None)
-    
-    view = ConfirmView()
+    view = ConfirmView(interaction.user.id, interaction.guild.id if interaction.guild else None)
     await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
 @bot.tree.command(name="bot_info", description="Show bot information and statistics")
+@guarded("fetching bot information")
 async def bot_info(interaction: discord.Interaction):
     """Show bot information and statistics"""
-    await bot.rate_limit_handler()
+    await interaction.response.defer()
     
-    if not interaction.guild:
-        await interaction.response.send_message("❌ This command can only be used in servers!", ephemeral=True)
-        return
+    stats = await bot.run_db(bot.db.get_server_stats, interaction.guild.id)
     
-    try:
-        stats = bot.db.get_server_stats(interaction.guild.id)
-        
-        embed = discord.Embed(
-            title="🤖 Football Club Bot Info",
-            description="Comprehensive football club management system",
-            color=discord.Color.blue(),
-            timestamp=datetime.now()
-        )
-        
-        embed.add_field(name="🏆 Total Clubs", value=str(stats['total_clubs']), inline=True)
-        embed.add_field(name="👥 Total Players", value=str(stats['total_players']), inline=True)
-        embed.add_field(name="📅 Upcoming Matches", value=str(stats['upcoming_matches']), inline=True)
-        embed.add_field(name="🔄 Total Transfers", value=str(stats['total_transfers']), inline=True)
-        embed.add_field(name="💰 Total Market Value", value=f"€{stats['total_value']:,.2f}", inline=True)
-        embed.add_field(name="🌐 Servers", value=str(len(bot.guilds)), inline=True)
-        
-        embed.set_footer(text="Created with ❤️ for football management")
-        await interaction.response.send_message(embed=embed)
-    except Exception as e:
-        logger.error(f"Error getting bot info: {e}")
-        await interaction.response.send_message("❌ An error occurred while fetching bot information.", ephemeral=True)
+    embed = _BOT_INFO_EMBED_TEMPLATE.copy()
+    embed.timestamp = datetime.now(timezone.utc)
+    
+    embed.add_field(name="🏆 Total Clubs", value=str(stats['total_clubs']), inline=True)
+    embed.add_field(name="👥 Total Players", value=str(stats['total_players']), inline=True)
+    embed.add_field(name="📅 Upcoming Matches", value=str(stats['upcoming_matches']), inline=True)
+    embed.add_field(name="🔄 Total Transfers", value=str(stats['total_transfers']), inline=True)
+    embed.add_field(name="💰 Total Market Value", value=_fmt_eur(stats['total_value']), inline=True)
+    embed.add_field(name="🌐 Servers", value=str(len(bot.guilds)), inline=True)
+    
+    await interaction.followup.send(embed=embed)
 
 # Image Upload Command
+
+# Image formats Discord can render inside an embed
+_IMAGE_CONTENT_TYPES = frozenset(('image/png', 'image/jpeg', 'image/gif', 'image/webp'))
+
+def _make_image_embed(title: str, description: str, url: str, uploader: str) -> discord.Embed:
+    """Build the embed posted by upload_image"""
+    embed = discord.Embed(
+        title=title,
+        description=description,
+        color=COLOR_GREEN,
+        timestamp=datetime.now(timezone.utc)
+    )
+    embed.set_image(url=url)
+    embed.set_footer(text=f"Uploaded by {uploader}")
+    return embed
+
 @bot.tree.command(name="upload_image", description="Upload an image with embed")
 @discord.app_commands.describe(
     title="Embed title",
@@ -807,28 +941,15 @@ async def bot_info(interaction: discord.Interaction):
     attachment="Image file to upload"
 )
 @is_admin()
+@guarded("uploading the image")
 async def upload_image(interaction: discord.Interaction, title: str, description: str, attachment: discord.Attachment):
     """Upload an image with custom embed"""
-    await bot.rate_limit_handler()
-    
-    try:
-        if not attachment.content_type or not attachment.content_type.startswith('image/'):
-            await interaction.response.send_message("❌ Please upload a valid image file!", ephemeral=True)
-            return
-            
-        embed = discord.Embed(
-            title=title,
-            description=description,
-            color=discord.Color.green(),
-            timestamp=datetime.now()
-        )
-        embed.set_image(url=attachment.url)
-        embed.set_footer(text=f"Uploaded by {interaction.user.display_name}")
+    if attachment.content_type not in _IMAGE_CONTENT_TYPES:
+        await interaction.response.send_message("❌ Please upload a valid image file!", ephemeral=True)
+        return
         
-        await interaction.response.send_message(embed=embed)
-    except Exception as e:
-        logger.error(f"Error uploading image: {e}")
-        await interaction.response.send_message("❌ An error occurred while uploading the image.", ephemeral=True)
+    embed = _make_image_embed(title, description, attachment.url, interaction.user.display_name)
+    await interaction.response.send_message(embed=embed)
 
 async def start_bot():
     """Start the Discord bot with proper error handling"""
@@ -837,18 +958,23 @@ async def start_bot():
         logger.error("DISCORD_TOKEN not found in environment variables")
         return
         
-    try:
-        await bot.start(token)
-    except discord.LoginFailure:
-        logger.error("Invalid bot token")
-    except discord.HTTPException as e:
-        if e.status == 429:
-            logger.warning(f"Rate limited: {e}")
-            await asyncio.sleep(60)  # Wait 1 minute before retrying
-            await start_bot()
-        else:
-            logger.error(f"HTTP error: {e}")
-    except Exception as e:
-        logger.error(f"Bot error: {e}")
-        await asyncio.sleep(30)  # Wait 30 seconds before retrying
-        await start_bot()
+    backoff = 1
+    while True:
+        try:
+            await bot.start(token)
+            return
+        except discord.LoginFailure:
+            logger.error("Invalid bot token")
+            return
+        except discord.HTTPException as e:
+            if e.status != 429:
+                logger.error("HTTP error: %s", e)
+                return
+            # Sleep only as long as Discord asks
+            retry_after = float(e.response.headers.get('Retry-After', backoff))
+            logger.warning("Rate limited, retrying in %.1f seconds: %s", retry_after, e)
+            await asyncio.sleep(retry_after)
+        except Exception:
+            logger.exception("Bot error, retrying in %d seconds", backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 300)
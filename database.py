@@ -6,590 +6,809 @@ SQLite database with comprehensive football management features
 
 import sqlite3
 import logging
+import functools
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, NamedTuple, Optional, Tuple
 import os
+import time
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
+class ClubRow(NamedTuple):
+    """A club along with its player count"""
+    id: int
+    guild_id: int
+    name: str
+    budget: float
+    created_at: str
+    player_count: int
+
+class PlayerRow(NamedTuple):
+    """A player joined with the name of their club"""
+    id: int
+    guild_id: int
+    name: str
+    club_id: Optional[int]
+    value: float
+    position: str
+    age: int
+    contract_end: Optional[str]
+    created_at: str
+    club_name: Optional[str]
+
+# Column lists matching the ClubRow and PlayerRow field order
+_CLUB_COLUMNS = "id, guild_id, name, budget, created_at, player_count"
+_PLAYER_COLUMNS = (
+    "p.id, p.guild_id, p.name, p.club_id, p.value, p.position, p.age, "
+    "p.contract_end, p.created_at, c.name as club_name"
+)
+
+# Per-guild reset, ordered so child rows go before the clubs they reference
+_RESET_STATEMENTS = tuple(
+    f"DELETE FROM {table} WHERE guild_id = ?"
+    for table in ('transfers', 'matches', 'players', 'clubs', 'bot_settings')
+)
+
+# Tables, created in one executescript call. executescript commits any open
+# transaction first, so these run on their own rather than inside transaction()
+_SCHEMA_SCRIPT = '''
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS clubs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    budget REAL NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    player_count INTEGER NOT NULL DEFAULT 0,
+    UNIQUE(guild_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    club_id INTEGER,
+    value REAL NOT NULL DEFAULT 0,
+    position TEXT DEFAULT 'Forward',
+    age INTEGER DEFAULT 25,
+    contract_end DATE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (club_id) REFERENCES clubs (id) ON DELETE SET NULL,
+    UNIQUE(guild_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    team1_id INTEGER NOT NULL,
+    team2_id INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    description TEXT DEFAULT 'League Match',
+    reminder_sent BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS transfers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    player_name TEXT NOT NULL,
+    from_club TEXT,
+    to_club TEXT,
+    fee REAL NOT NULL DEFAULT 0,
+    admin_id INTEGER NOT NULL,
+    date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS bot_settings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    setting_name TEXT NOT NULL,
+    setting_value TEXT,
+    UNIQUE(guild_id, setting_name)
+);
+
+COMMIT;
+'''
+
+# Triggers keeping clubs.player_count in step with the players table, plus
+# indexes for the guild/club/time filters used by every query;
+# players(guild_id) is already covered by UNIQUE(guild_id, name)
+_INDEX_SCRIPT = '''
+BEGIN;
+
+CREATE TRIGGER IF NOT EXISTS trg_players_insert_count
+AFTER INSERT ON players WHEN NEW.club_id IS NOT NULL
+BEGIN
+    UPDATE clubs SET player_count = player_count + 1 WHERE id = NEW.club_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_players_delete_count
+AFTER DELETE ON players WHEN OLD.club_id IS NOT NULL
+BEGIN
+    UPDATE clubs SET player_count = player_count - 1 WHERE id = OLD.club_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_players_move_count
+AFTER UPDATE OF club_id ON players WHEN OLD.club_id IS NOT NEW.club_id
+BEGIN
+    UPDATE clubs SET player_count = player_count - 1 WHERE id = OLD.club_id;
+    UPDATE clubs SET player_count = player_count + 1 WHERE id = NEW.club_id;
+END;
+
+CREATE INDEX IF NOT EXISTS idx_players_club ON players (club_id);
+CREATE INDEX IF NOT EXISTS idx_matches_ts_sent ON matches (reminder_sent, ts);
+CREATE INDEX IF NOT EXISTS idx_matches_guild_ts ON matches (guild_id, ts);
+CREATE INDEX IF NOT EXISTS idx_transfers_guild_date ON transfers (guild_id, date DESC);
+CREATE INDEX IF NOT EXISTS idx_transfers_to_club ON transfers (guild_id, to_club);
+CREATE INDEX IF NOT EXISTS idx_transfers_from_club ON transfers (guild_id, from_club);
+
+COMMIT;
+
+ANALYZE;
+'''
+
+def _empty_server_stats() -> Dict:
+    return {
+        'total_clubs': 0,
+        'total_players': 0,
+        'upcoming_matches': 0,
+        'total_transfers': 0,
+        'total_value': 0
+    }
+
+def _empty_preview() -> Tuple[List, int]:
+    return [], 0
+
+def _legacy_match_ts(row: sqlite3.Row) -> int:
+    """Unix start time of a matches row from before the NOT NULL ts column"""
+    if 'ts' in row.keys() and row['ts'] is not None:
+        return row['ts']
+    return int(datetime.strptime(row['datetime'], '%Y-%m-%d %H:%M').timestamp())
+
+def db_safe(default=None):
+    """Return `default` instead of raising when a Database method fails
+    
+    Integrity errors (duplicate names and the like) are expected and return
+    quietly; anything else is logged with its traceback. Pass a callable such
+    as `list` for mutable defaults so callers never share one instance.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except sqlite3.IntegrityError:
+                pass
+            except Exception:
+                logger.exception("Database error in %s", func.__name__)
+            return default() if callable(default) else default
+        return wrapper
+    return decorator
+
 class Database:
     def __init__(self, db_path: str = "football_bot.db"):
         self.db_path = db_path
+        
+        # One long-lived connection shared by all callers; the bot runs queries
+        # from worker threads, so access is serialized with a re-entrant lock
+        self._lock = threading.RLock()
+        self._depth = 0
+        # isolation_level=None leaves transaction control to transaction()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._configure_connection()
+        
+        self._club_cache = OrderedDict()  # (guild_id, name) -> club row, in LRU order
+        self._club_cache_size = 512
+        
+        # Short-lived cache for the stats queries behind bot_info and club_stats
+        self._stats_cache = {}  # ('server'|'club', guild_id, ...) -> (expires_at, stats)
+        self._stats_cache_size = 256
+        self._stats_ttl = 15
+        
         self.init_database()
     
+    def _configure_connection(self):
+        """Apply performance PRAGMAs to the shared connection"""
+        # WAL with synchronous=NORMAL skips the fsync on every commit; a power
+        # loss can drop the last few commits but never corrupts the database
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
+        self._conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        self._conn.execute("PRAGMA foreign_keys=ON")
+    
+    @contextmanager
     def get_connection(self):
-        """Get database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Borrow the shared connection; single statements autocommit"""
+        with self._lock:
+            yield self._conn
+    
+    @contextmanager
+    def transaction(self):
+        """Run a block of statements atomically on the shared connection
+        
+        Nested calls use savepoints, so an inner failure only undoes its own work.
+        """
+        with self._lock:
+            self._depth += 1
+            savepoint = f"sp_{self._depth}"
+            self._conn.execute("BEGIN IMMEDIATE" if self._depth == 1 else f"SAVEPOINT {savepoint}")
+            try:
+                yield self._conn
+            except BaseException:
+                if self._depth == 1:
+                    self._conn.execute("ROLLBACK")
+                else:
+                    self._conn.execute(f"ROLLBACK TO {savepoint}")
+                    self._conn.execute(f"RELEASE {savepoint}")
+                raise
+            else:
+                self._conn.execute("COMMIT" if self._depth == 1 else f"RELEASE {savepoint}")
+            finally:
+                self._depth -= 1
+    
+    def _invalidate_clubs(self, guild_id: int, *names: str):
+        """Drop cached club rows after a write; no names clears the whole guild"""
+        with self._lock:
+            if names:
+                for name in names:
+                    self._club_cache.pop((guild_id, name), None)
+            else:
+                for key in [key for key in self._club_cache if key[0] == guild_id]:
+                    del self._club_cache[key]
+    
+    def _get_cached_stats(self, key: Tuple) -> Optional[Dict]:
+        """Return a fresh cached stats result, or None if missing or expired"""
+        with self._lock:
+            entry = self._stats_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, stats = entry
+            if expires_at < time.monotonic():
+                del self._stats_cache[key]
+                return None
+            return dict(stats)
+    
+    def _store_stats(self, key: Tuple, stats: Dict):
+        """Cache a stats result for the TTL, evicting the oldest entry when full"""
+        with self._lock:
+            self._stats_cache.pop(key, None)
+            self._stats_cache[key] = (time.monotonic() + self._stats_ttl, dict(stats))
+            if len(self._stats_cache) > self._stats_cache_size:
+                self._stats_cache.pop(next(iter(self._stats_cache)))
+    
+    def _invalidate_stats(self, guild_id: int):
+        """Drop cached server and club stats for a guild after a write"""
+        with self._lock:
+            for key in [key for key in self._stats_cache if key[1] == guild_id]:
+                del self._stats_cache[key]
     
     def init_database(self):
         """Initialize the database with all required tables"""
         try:
             with self.get_connection() as conn:
+                conn.executescript(_SCHEMA_SCRIPT)
+            
+            with self.transaction() as conn:
                 cursor = conn.cursor()
                 
-                # Clubs table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS clubs (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        guild_id INTEGER NOT NULL,
-                        name TEXT NOT NULL,
-                        budget REAL NOT NULL DEFAULT 0,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        UNIQUE(guild_id, name)
-                    )
-                ''')
-                
-                # Players table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS players (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        guild_id INTEGER NOT NULL,
-                        name TEXT NOT NULL,
-                        club_id INTEGER,
-                        value REAL NOT NULL DEFAULT 0,
-                        position TEXT DEFAULT 'Forward',
-                        age INTEGER DEFAULT 25,
-                        contract_end DATE,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (club_id) REFERENCES clubs (id) ON DELETE SET NULL,
-                        UNIQUE(guild_id, name)
-                    )
-                ''')
-                
-                # Matches table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS matches (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        guild_id INTEGER NOT NULL,
-                        team1_id INTEGER NOT NULL,
-                        team2_id INTEGER NOT NULL,
-                        datetime TEXT NOT NULL,
-                        description TEXT DEFAULT 'League Match',
-                        reminder_sent BOOLEAN DEFAULT FALSE,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # Transfer history table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS transfers (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        guild_id INTEGER NOT NULL,
-                        player_name TEXT NOT NULL,
-                        from_club TEXT,
-                        to_club TEXT,
-                        fee REAL NOT NULL DEFAULT 0,
-                        admin_id INTEGER NOT NULL,
-                        date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                # Clubs tables created before player_count existed need it backfilled
+                cursor.execute("PRAGMA table_info(clubs)")
+                if 'player_count' not in {row['name'] for row in cursor.fetchall()}:
+                    cursor.execute("ALTER TABLE clubs ADD COLUMN player_count INTEGER NOT NULL DEFAULT 0")
+                    cursor.execute('''
+                        UPDATE clubs SET player_count = (
+                            SELECT COUNT(*) FROM players WHERE players.club_id = clubs.id
+                        )
+                    ''')
+                
+                # Older matches tables stored the start time as 'YYYY-MM-DD HH:MM'
+                # text. SQLite can't add a NOT NULL column to existing rows, so
+                # rebuild the table with the unix epoch column and copy them over
+                cursor.execute("PRAGMA table_info(matches)")
+                match_columns = {row['name']: row for row in cursor.fetchall()}
+                if 'datetime' in match_columns or not match_columns['ts']['notnull']:
+                    cursor.execute('''
+                        CREATE TABLE matches_new (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            guild_id INTEGER NOT NULL,
+                            team1_id INTEGER NOT NULL,
+                            team2_id INTEGER NOT NULL,
+                            ts INTEGER NOT NULL,
+                            description TEXT DEFAULT 'League Match',
+                            reminder_sent BOOLEAN DEFAULT FALSE,
+                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                        )
+                    ''')
+                    cursor.execute("SELECT * FROM matches")
+                    cursor.executemany(
+                        '''
+                        INSERT INTO matches_new (id, guild_id, team1_id, team2_id, ts, description, reminder_sent, created_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        ''',
+                        [
+                            (
+                                row['id'], row['guild_id'], row['team1_id'], row['team2_id'], _legacy_match_ts(row),
+                                row['description'], row['reminder_sent'], row['created_at']
+                            )
+                            for row in cursor.fetchall()
+                        ]
                     )
-                ''')
-                
-                # Bot settings table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS bot_settings (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        guild_id INTEGER NOT NULL,
-                        setting_name TEXT NOT NULL,
-                        setting_value TEXT,
-                        UNIQUE(guild_id, setting_name)
-                    )
-                ''')
-                
-                conn.commit()
-                logger.info("Database initialized successfully")
+                    cursor.execute("DROP TABLE matches")
+                    cursor.execute("ALTER TABLE matches_new RENAME TO matches")
+            
+            # Triggers and indexes go last, once the migrated columns exist
+            with self.get_connection() as conn:
+                conn.executescript(_INDEX_SCRIPT)
+            
+            logger.info("Database initialized successfully")
                 
-        except Exception as e:
-            logger.error(f"Error initializing database: {e}")
+        except Exception:
+            logger.exception("Error initializing database")
             raise
     
     # Club Management Methods
     
+    @db_safe(False)
     def create_club(self, guild_id: int, name: str, budget: float) -> bool:
         """Create a new club"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "INSERT INTO clubs (guild_id, name, budget) VALUES (?, ?, ?)",
-                    (guild_id, name, budget)
-                )
-                conn.commit()
-                return True
-        except sqlite3.IntegrityError:
-            return False  # Club already exists
-        except Exception as e:
-            logger.error(f"Error creating club: {e}")
-            return False
+        with self.get_connection() as conn:
+            self._invalidate_stats(guild_id)
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO clubs (guild_id, name, budget) VALUES (?, ?, ?)",
+                (guild_id, name, budget)
+            )
+            return True
     
+    @db_safe(False)
     def delete_club(self, guild_id: int, name: str) -> bool:
         """Delete a club and set all its players as free agents"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Get club ID
-                cursor.execute(
-                    "SELECT id FROM clubs WHERE guild_id = ? AND name = ?",
-                    (guild_id, name)
-                )
-                club = cursor.fetchone()
-                
-                if not club:
-                    return False
-                
-                # Set players as free agents
-                cursor.execute(
-                    "UPDATE players SET club_id = NULL WHERE club_id = ?",
-                    (club['id'],)
-                )
-                
-                # Delete the club
-                cursor.execute(
-                    "DELETE FROM clubs WHERE id = ?",
-                    (club['id'],)
-                )
-                
-                conn.commit()
-                return True
-        except Exception as e:
-            logger.error(f"Error deleting club: {e}")
-            return False
+        with self.get_connection() as conn:
+            self._invalidate_stats(guild_id)
+            cursor = conn.cursor()
+            self._invalidate_clubs(guild_id, name)
+            
+            # players.club_id is ON DELETE SET NULL, so with foreign keys
+            # enabled SQLite frees the club's players itself
+            cursor.execute(
+                "DELETE FROM clubs WHERE guild_id = ? AND name = ?",
+                (guild_id, name)
+            )
+            return cursor.rowcount > 0
     
+    @db_safe(list)
     def get_clubs(self, guild_id: int) -> List[Dict]:
         """Get all clubs in a guild"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT * FROM clubs WHERE guild_id = ? ORDER BY budget DESC",
-                    (guild_id,)
-                )
-                return [dict(row) for row in cursor.fetchall()]
-        except Exception as e:
-            logger.error(f"Error getting clubs: {e}")
-            return []
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM clubs WHERE guild_id = ? ORDER BY budget DESC",
+                (guild_id,)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+    
+    @db_safe(list)
+    def get_clubs_with_counts(self, guild_id: int) -> List[ClubRow]:
+        """Get all clubs in a guild along with their player counts"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {_CLUB_COLUMNS} FROM clubs WHERE guild_id = ? ORDER BY budget DESC",
+                (guild_id,)
+            )
+            return [ClubRow(*row) for row in cursor.fetchall()]
     
+    @db_safe(False)
     def update_club_budget(self, guild_id: int, name: str, budget: float) -> bool:
         """Update a club's budget"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "UPDATE clubs SET budget = ? WHERE guild_id = ? AND name = ?",
-                    (budget, guild_id, name)
-                )
-                conn.commit()
-                return cursor.rowcount > 0
-        except Exception as e:
-            logger.error(f"Error updating club budget: {e}")
-            return False
+        with self.get_connection() as conn:
+            self._invalidate_stats(guild_id)
+            cursor = conn.cursor()
+            self._invalidate_clubs(guild_id, name)
+            cursor.execute(
+                "UPDATE clubs SET budget = ? WHERE guild_id = ? AND name = ?",
+                (budget, guild_id, name)
+            )
+            return cursor.rowcount > 0
     
+    @db_safe()
     def get_club_by_name(self, guild_id: int, name: str) -> Optional[Dict]:
-        """Get a club by name"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT * FROM clubs WHERE guild_id = ? AND name = ?",
-                    (guild_id, name)
-                )
-                row = cursor.fetchone()
-                return dict(row) if row else None
-        except Exception as e:
-            logger.error(f"Error getting club: {e}")
-            return None
+        """Get a club by name, served from the LRU cache when possible"""
+        key = (guild_id, name)
+        with self.get_connection() as conn:
+            club = self._club_cache.get(key)
+            if club is not None:
+                self._club_cache.move_to_end(key)
+                return dict(club)
+            
+            cursor = conn.cursor()
+            # player_count changes without invalidating this cache, so leave it out
+            cursor.execute(
+                "SELECT id, guild_id, name, budget, created_at FROM clubs WHERE guild_id = ? AND name = ?",
+                (guild_id, name)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            
+            club = dict(row)
+            self._club_cache[key] = club
+            if len(self._club_cache) > self._club_cache_size:
+                self._club_cache.popitem(last=False)
+            return dict(club)
     
     # Player Management Methods
     
+    @db_safe(False)
     def add_player(self, guild_id: int, name: str, club_name: str, value: float, position: str = "Forward", age: int = 25) -> bool:
         """Add a player to a club"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Get club ID
-                club = self.get_club_by_name(guild_id, club_name)
-                if not club:
-                    return False
-                
-                # Add contract end date (2 years from now)
-                contract_end = (datetime.now() + timedelta(days=730)).strftime('%Y-%m-%d')
-                
-                cursor.execute(
-                    "INSERT INTO players (guild_id, name, club_id, value, position, age, contract_end) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                    (guild_id, name, club['id'], value, position, age, contract_end)
-                )
-                conn.commit()
-                return True
-        except sqlite3.IntegrityError:
-            return False  # Player already exists
-        except Exception as e:
-            logger.error(f"Error adding player: {e}")
-            return False
+        with self.get_connection() as conn:
+            self._invalidate_stats(guild_id)
+            cursor = conn.cursor()
+            
+            # Get club ID
+            club = self.get_club_by_name(guild_id, club_name)
+            if not club:
+                return False
+            
+            # Add contract end date (2 years from now)
+            contract_end = (datetime.now() + timedelta(days=730)).strftime('%Y-%m-%d')
+            
+            cursor.execute(
+                "INSERT INTO players (guild_id, name, club_id, value, position, age, contract_end) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (guild_id, name, club['id'], value, position, age, contract_end)
+            )
+            return True
+    
+    @db_safe(0)
+    def bulk_add_players(self, rows: List[Tuple]) -> int:
+        """Insert many players at once
+        
+        Each row is (guild_id, name, club_id, value, position, age, contract_end).
+        Returns the number of players inserted, or 0 if the batch was rejected.
+        """
+        with self.transaction() as conn:
+            for guild_id in {row[0] for row in rows}:
+                self._invalidate_stats(guild_id)
+            cursor = conn.cursor()
+            cursor.executemany(
+                "INSERT INTO players (guild_id, name, club_id, value, position, age, contract_end) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            return cursor.rowcount
     
+    @db_safe(False)
     def remove_player(self, guild_id: int, name: str) -> bool:
         """Remove a player"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "DELETE FROM players WHERE guild_id = ? AND name = ?",
-                    (guild_id, name)
-                )
-                conn.commit()
-                return cursor.rowcount > 0
-        except Exception as e:
-            logger.error(f"Error removing player: {e}")
-            return False
+        with self.get_connection() as conn:
+            self._invalidate_stats(guild_id)
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM players WHERE guild_id = ? AND name = ?",
+                (guild_id, name)
+            )
+            return cursor.rowcount > 0
     
+    @db_safe(False)
     def update_player_value(self, guild_id: int, name: str, value: float) -> bool:
         """Update a player's value"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "UPDATE players SET value = ? WHERE guild_id = ? AND name = ?",
-                    (value, guild_id, name)
-                )
-                conn.commit()
-                return cursor.rowcount > 0
-        except Exception as e:
-            logger.error(f"Error updating player value: {e}")
-            return False
+        with self.get_connection() as conn:
+            self._invalidate_stats(guild_id)
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE players SET value = ? WHERE guild_id = ? AND name = ?",
+                (value, guild_id, name)
+            )
+            return cursor.rowcount > 0
     
+    @db_safe(False)
     def transfer_player(self, guild_id: int, player_name: str, from_club: str, to_club: str, transfer_fee: float) -> bool:
         """Transfer a player between clubs"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Get clubs
-                from_club_data = self.get_club_by_name(guild_id, from_club)
-                to_club_data = self.get_club_by_name(guild_id, to_club)
-                
-                if not from_club_data or not to_club_data:
-                    return False
-                
-                # Check if destination club has enough budget
-                if to_club_data['budget'] < transfer_fee:
-                    return False
-                
-                # Update player's club
-                cursor.execute(
-                    "UPDATE players SET club_id = ? WHERE guild_id = ? AND name = ? AND club_id = ?",
-                    (to_club_data['id'], guild_id, player_name, from_club_data['id'])
-                )
-                
-                if cursor.rowcount == 0:
-                    return False
-                
-                # Update club budgets
-                cursor.execute(
-                    "UPDATE clubs SET budget = budget + ? WHERE id = ?",
-                    (transfer_fee, from_club_data['id'])
-                )
-                cursor.execute(
-                    "UPDATE clubs SET budget = budget - ? WHERE id = ?",
-                    (transfer_fee, to_club_data['id'])
+        params = {
+            'guild_id': guild_id,
+            'player': player_name,
+            'from_club': from_club,
+            'to_club': to_club,
+            'fee': transfer_fee
+        }
+        with self.transaction() as conn:
+            self._invalidate_stats(guild_id)
+            cursor = conn.cursor()
+            
+            # Charge the destination club only if it can afford the fee and
+            # the player currently belongs to the source club
+            cursor.execute('''
+                UPDATE clubs SET budget = budget - :fee
+                WHERE guild_id = :guild_id AND name = :to_club AND budget >= :fee
+                AND EXISTS (
+                    SELECT 1 FROM players p
+                    JOIN clubs f ON p.club_id = f.id
+                    WHERE p.guild_id = :guild_id AND p.name = :player AND f.name = :from_club
                 )
-                
-                conn.commit()
-                return True
-        except Exception as e:
-            logger.error(f"Error transferring player: {e}")
-            return False
+            ''', params)
+            
+            if cursor.rowcount == 0:
+                return False
+            
+            self._invalidate_clubs(guild_id, from_club, to_club)
+            
+            cursor.execute(
+                "UPDATE clubs SET budget = budget + :fee WHERE guild_id = :guild_id AND name = :from_club",
+                params
+            )
+            
+            # Update player's club
+            cursor.execute('''
+                UPDATE players
+                SET club_id = (SELECT id FROM clubs WHERE guild_id = :guild_id AND name = :to_club)
+                WHERE guild_id = :guild_id AND name = :player
+            ''', params)
+            
+            return True
+    
+    @db_safe(False)
+    def transfer_and_log(self, guild_id: int, player_name: str, from_club: str, to_club: str, transfer_fee: float, admin_id: int) -> bool:
+        """Transfer a player and record it in the history in one transaction"""
+        with self.transaction() as conn:
+            self._invalidate_stats(guild_id)
+            if not self.transfer_player(guild_id, player_name, from_club, to_club, transfer_fee):
+                return False
+            
+            conn.execute(
+                "INSERT INTO transfers (guild_id, player_name, from_club, to_club, fee, admin_id) VALUES (?, ?, ?, ?, ?, ?)",
+                (guild_id, player_name, from_club, to_club, transfer_fee, admin_id)
+            )
+            return True
     
-    def get_club_players(self, guild_id: int, club_name: str) -> List[Dict]:
+    @db_safe(list)
+    def get_club_players(self, guild_id: int, club_name: str) -> List[PlayerRow]:
         """Get all players in a club"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT p.*, c.name as club_name 
-                    FROM players p 
-                    LEFT JOIN clubs c ON p.club_id = c.id 
-                    WHERE p.guild_id = ? AND c.name = ?
-                    ORDER BY p.value DESC
-                ''', (guild_id, club_name))
-                return [dict(row) for row in cursor.fetchall()]
-        except Exception as e:
-            logger.error(f"Error getting club players: {e}")
-            return []
-    
-    def get_all_players(self, guild_id: int) -> List[Dict]:
-        """Get all players in a guild"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT p.*, c.name as club_name 
-                    FROM players p 
-                    LEFT JOIN clubs c ON p.club_id = c.id 
-                    WHERE p.guild_id = ?
-                    ORDER BY p.value DESC
-                ''', (guild_id,))
-                return [dict(row) for row in cursor.fetchall()]
-        except Exception as e:
-            logger.error(f"Error getting all players: {e}")
-            return []
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {_PLAYER_COLUMNS}
+                FROM players p 
+                LEFT JOIN clubs c ON p.club_id = c.id 
+                WHERE p.guild_id = ? AND c.name = ?
+                ORDER BY p.value DESC
+            ''', (guild_id, club_name))
+            return [PlayerRow(*row) for row in cursor.fetchall()]
+    
+    @db_safe(_empty_preview)
+    def preview_all_players(self, guild_id: int, limit: int) -> Tuple[List[PlayerRow], int]:
+        """Get the top `limit` players in a guild along with the total count"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {_PLAYER_COLUMNS}
+                FROM players p 
+                LEFT JOIN clubs c ON p.club_id = c.id 
+                WHERE p.guild_id = ?
+                ORDER BY p.value DESC
+                LIMIT ?
+            ''', (guild_id, limit))
+            preview = [PlayerRow(*row) for row in cursor.fetchall()]
+            
+            cursor.execute("SELECT COUNT(*) FROM players WHERE guild_id = ?", (guild_id,))
+            return preview, cursor.fetchone()[0]
     
+    @db_safe(0)
     def get_player_count(self, club_id: int) -> int:
         """Get the number of players in a club"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT COUNT(*) as count FROM players WHERE club_id = ?",
-                    (club_id,)
-                )
-                return cursor.fetchone()['count']
-        except Exception as e:
-            logger.error(f"Error getting player count: {e}")
-            return 0
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT player_count FROM clubs WHERE id = ?",
+                (club_id,)
+            )
+            row = cursor.fetchone()
+            return row['player_count'] if row else 0
     
     # Match Management Methods
     
-    def create_match(self, guild_id: int, team1_id: int, team2_id: int, datetime_str: str, description: str) -> Optional[int]:
-        """Create a new match"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "INSERT INTO matches (guild_id, team1_id, team2_id, datetime, description) VALUES (?, ?, ?, ?, ?)",
-                    (guild_id, team1_id, team2_id, datetime_str, description)
-                )
-                conn.commit()
-                return cursor.lastrowid
-        except Exception as e:
-            logger.error(f"Error creating match: {e}")
-            return None
+    @db_safe()
+    def create_match(self, guild_id: int, team1_id: int, team2_id: int, ts: int, description: str) -> Optional[int]:
+        """Create a new match starting at the given unix epoch"""
+        with self.get_connection() as conn:
+            self._invalidate_stats(guild_id)
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO matches (guild_id, team1_id, team2_id, ts, description) VALUES (?, ?, ?, ?, ?)",
+                (guild_id, team1_id, team2_id, ts, description)
+            )
+            return cursor.lastrowid
     
+    @db_safe(list)
     def get_upcoming_matches(self, guild_id: Optional[int] = None) -> List[Dict]:
         """Get upcoming matches"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                current_time = datetime.now().strftime('%Y-%m-%d %H:%M')
-                
-                if guild_id:
-                    cursor.execute(
-                        "SELECT * FROM matches WHERE guild_id = ? AND datetime > ? ORDER BY datetime ASC",
-                        (guild_id, current_time)
-                    )
-                else:
-                    cursor.execute(
-                        "SELECT * FROM matches WHERE datetime > ? ORDER BY datetime ASC",
-                        (current_time,)
-                    )
-                
-                return [dict(row) for row in cursor.fetchall()]
-        except Exception as e:
-            logger.error(f"Error getting upcoming matches: {e}")
-            return []
-    
-    def mark_reminder_sent(self, match_id: int):
-        """Mark that a reminder has been sent for a match"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            current_ts = int(time.time())
+            
+            if guild_id:
+                cursor.execute(
+                    "SELECT * FROM matches WHERE guild_id = ? AND ts > ? ORDER BY ts ASC",
+                    (guild_id, current_ts)
+                )
+            else:
                 cursor.execute(
-                    "UPDATE matches SET reminder_sent = TRUE WHERE id = ?",
-                    (match_id,)
+                    "SELECT * FROM matches WHERE ts > ? ORDER BY ts ASC",
+                    (current_ts,)
                 )
-                conn.commit()
-        except Exception as e:
-            logger.error(f"Error marking reminder sent: {e}")
+            
+            return [dict(row) for row in cursor.fetchall()]
+    
+    @db_safe(list)
+    def get_pending_reminders(self, now_ts: int) -> List[Dict]:
+        """Get upcoming matches whose reminder has not been sent yet"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM matches WHERE reminder_sent = 0 AND ts > ? ORDER BY ts ASC",
+                (now_ts,)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+    
+    @db_safe()
+    def mark_reminders_sent(self, match_ids: List[int]):
+        """Mark that reminders have been sent for a batch of matches"""
+        if not match_ids:
+            return
+        
+        placeholders = ", ".join("?" * len(match_ids))
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"UPDATE matches SET reminder_sent = TRUE WHERE id IN ({placeholders})",
+                list(match_ids)
+            )
     
     # Transfer History Methods
     
+    @db_safe()
     def log_transfer(self, guild_id: int, player_name: str, from_club: str, to_club: str, fee: float, admin_id: int):
         """Log a transfer to history"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "INSERT INTO transfers (guild_id, player_name, from_club, to_club, fee, admin_id) VALUES (?, ?, ?, ?, ?, ?)",
-                    (guild_id, player_name, from_club, to_club, fee, admin_id)
-                )
-                conn.commit()
-        except Exception as e:
-            logger.error(f"Error logging transfer: {e}")
+        with self.get_connection() as conn:
+            self._invalidate_stats(guild_id)
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO transfers (guild_id, player_name, from_club, to_club, fee, admin_id) VALUES (?, ?, ?, ?, ?, ?)",
+                (guild_id, player_name, from_club, to_club, fee, admin_id)
+            )
     
+    @db_safe(list)
     def get_transfer_history(self, guild_id: int, limit: int = 20) -> List[Dict]:
         """Get transfer history"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT * FROM transfers WHERE guild_id = ? ORDER BY date DESC LIMIT ?",
-                    (guild_id, limit)
-                )
-                return [dict(row) for row in cursor.fetchall()]
-        except Exception as e:
-            logger.error(f"Error getting transfer history: {e}")
-            return []
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM transfers WHERE guild_id = ? ORDER BY date DESC LIMIT ?",
+                (guild_id, limit)
+            )
+            return [dict(row) for row in cursor.fetchall()]
     
     # Statistics Methods
     
+    @db_safe()
     def get_club_stats(self, guild_id: int, club_name: str) -> Optional[Dict]:
         """Get comprehensive club statistics"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Get club basic info
-                club = self.get_club_by_name(guild_id, club_name)
-                if not club:
-                    return None
-                
-                # Get player statistics
-                cursor.execute('''
-                    SELECT 
-                        COUNT(*) as player_count,
-                        COALESCE(SUM(value), 0) as total_value,
-                        COALESCE(AVG(value), 0) as avg_value,
-                        COALESCE(MAX(value), 0) as highest_value
-                    FROM players 
-                    WHERE club_id = ?
-                ''', (club['id'],))
-                
-                stats = dict(cursor.fetchone())
-                
-                # Get most valuable player
-                cursor.execute(
-                    "SELECT name FROM players WHERE club_id = ? ORDER BY value DESC LIMIT 1",
-                    (club['id'],)
-                )
-                most_valuable = cursor.fetchone()
-                stats['most_valuable'] = most_valuable['name'] if most_valuable else 'None'
-                
-                # Get transfer counts
-                cursor.execute(
-                    "SELECT COUNT(*) as transfers_in FROM transfers WHERE guild_id = ? AND to_club = ?",
-                    (guild_id, club_name)
-                )
-                stats['transfers_in'] = cursor.fetchone()['transfers_in']
-                
-                cursor.execute(
-                    "SELECT COUNT(*) as transfers_out FROM transfers WHERE guild_id = ? AND from_club = ?",
-                    (guild_id, club_name)
-                )
-                stats['transfers_out'] = cursor.fetchone()['transfers_out']
-                
-                # Combine with club data
-                result = {**club, **stats}
-                return result
-                
-        except Exception as e:
-            logger.error(f"Error getting club stats: {e}")
-            return None
+        key = ('club', guild_id, club_name)
+        stats = self._get_cached_stats(key)
+        if stats is not None:
+            return stats
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT
+                    c.id, c.guild_id, c.name, c.budget, c.created_at,
+                    COUNT(p.id) as player_count,
+                    COALESCE(SUM(p.value), 0) as total_value,
+                    COALESCE(AVG(p.value), 0) as avg_value,
+                    COALESCE(MAX(p.value), 0) as highest_value,
+                    COALESCE((
+                        SELECT name FROM players
+                        WHERE club_id = c.id
+                        ORDER BY value DESC LIMIT 1
+                    ), 'None') as most_valuable,
+                    (
+                        SELECT COUNT(*) FROM transfers
+                        WHERE guild_id = c.guild_id AND to_club = c.name
+                    ) as transfers_in,
+                    (
+                        SELECT COUNT(*) FROM transfers
+                        WHERE guild_id = c.guild_id AND from_club = c.name
+                    ) as transfers_out
+                FROM clubs c
+                LEFT JOIN players p ON p.club_id = c.id
+                WHERE c.guild_id = ? AND c.name = ?
+                GROUP BY c.id
+            ''', (guild_id, club_name))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            
+            stats = dict(row)
+            self._store_stats(key, stats)
+            return stats
     
-    def get_top_players(self, guild_id: int, limit: int = 10) -> List[Dict]:
+    @db_safe(list)
+    def get_top_players(self, guild_id: int, limit: int = 10) -> List[PlayerRow]:
         """Get top players by value"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT p.*, c.name as club_name 
-                    FROM players p 
-                    LEFT JOIN clubs c ON p.club_id = c.id 
-                    WHERE p.guild_id = ?
-                    ORDER BY p.value DESC 
-                    LIMIT ?
-                ''', (guild_id, limit))
-                return [dict(row) for row in cursor.fetchall()]
-        except Exception as e:
-            logger.error(f"Error getting top players: {e}")
-            return []
-    
-    def get_richest_clubs(self, guild_id: int, limit: int = 10) -> List[Dict]:
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {_PLAYER_COLUMNS}
+                FROM players p 
+                LEFT JOIN clubs c ON p.club_id = c.id 
+                WHERE p.guild_id = ?
+                ORDER BY p.value DESC 
+                LIMIT ?
+            ''', (guild_id, limit))
+            return [PlayerRow(*row) for row in cursor.fetchall()]
+    
+    @db_safe(list)
+    def get_richest_clubs(self, guild_id: int, limit: int = 10) -> List[ClubRow]:
         """Get richest clubs"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT c.*, COUNT(p.id) as player_count
-                    FROM clubs c
-                    LEFT JOIN players p ON c.id = p.club_id
-                    WHERE c.guild_id = ?
-                    GROUP BY c.id
-                    ORDER BY c.budget DESC
-                    LIMIT ?
-                ''', (guild_id, limit))
-                return [dict(row) for row in cursor.fetchall()]
-        except Exception as e:
-            logger.error(f"Error getting richest clubs: {e}")
-            return []
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {_CLUB_COLUMNS} FROM clubs WHERE guild_id = ? ORDER BY budget DESC LIMIT ?",
+                (guild_id, limit)
+            )
+            return [ClubRow(*row) for row in cursor.fetchall()]
     
+    @db_safe(_empty_server_stats)
     def get_server_stats(self, guild_id: int) -> Dict:
         """Get comprehensive server statistics"""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                stats = {}
-                
-                # Total clubs
-                cursor.execute("SELECT COUNT(*) as count FROM clubs WHERE guild_id = ?", (guild_id,))
-                stats['total_clubs'] = cursor.fetchone()['count']
-                
-                # Total players
-                cursor.execute("SELECT COUNT(*) as count FROM players WHERE guild_id = ?", (guild_id,))
-                stats['total_players'] = cursor.fetchone()['count']
-                
-                # Upcoming matches
-                current_time = datetime.now().strftime('%Y-%m-%d %H:%M')
-                cursor.execute(
-                    "SELECT COUNT(*) as count FROM matches WHERE guild_id = ? AND datetime > ?",
-                    (guild_id, current_time)
-                )
-                stats['upcoming_matches'] = cursor.fetchone()['count']
-                
-                # Total transfers
-                cursor.execute("SELECT COUNT(*) as count FROM transfers WHERE guild_id = ?", (guild_id,))
-                stats['total_transfers'] = cursor.fetchone()['count']
-                
-                # Total market value
-                cursor.execute("SELECT COALESCE(SUM(value), 0) as total FROM players WHERE guild_id = ?", (guild_id,))
-                stats['total_value'] = cursor.fetchone()['total']
-                
-                return stats
-                
-        except Exception as e:
-            logger.error(f"Error getting server stats: {e}")
-            return {
-                'total_clubs': 0,
-                'total_players': 0,
-                'upcoming_matches': 0,
-                'total_transfers': 0,
-                'total_value': 0
-            }
+        key = ('server', guild_id)
+        stats = self._get_cached_stats(key)
+        if stats is not None:
+            return stats
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT
+                    (SELECT COUNT(*) FROM clubs WHERE guild_id = ?1) as total_clubs,
+                    (SELECT COUNT(*) FROM players WHERE guild_id = ?1) as total_players,
+                    (SELECT COUNT(*) FROM matches WHERE guild_id = ?1 AND ts > ?2) as upcoming_matches,
+                    (SELECT COUNT(*) FROM transfers WHERE guild_id = ?1) as total_transfers,
+                    (SELECT COALESCE(SUM(value), 0) FROM players WHERE guild_id = ?1) as total_value
+            ''', (guild_id, int(time.time())))
+            stats = dict(cursor.fetchone())
+            self._store_stats(key, stats)
+            return stats
     
     # Utility Methods
     
     def reset_all_data(self, guild_id: int):
         """Reset all data for a guild"""
         try:
-            with self.get_connection() as conn:
+            with self.transaction() as conn:
+                self._invalidate_stats(guild_id)
                 cursor = conn.cursor()
                 
-                # Delete in correct order to handle foreign keys
-                cursor.execute("DELETE FROM transfers WHERE guild_id = ?", (guild_id,))
-                cursor.execute("DELETE FROM matches WHERE guild_id = ?", (guild_id,))
-                cursor.execute("DELETE FROM players WHERE guild_id = ?", (guild_id,))
-                cursor.execute("DELETE FROM clubs WHERE guild_id = ?", (guild_id,))
-                cursor.execute("DELETE FROM bot_settings WHERE guild_id = ?", (guild_id,))
+                params = (guild_id,)
+                for statement in _RESET_STATEMENTS:
+                    cursor.execute(statement, params)
+                
+                self._invalidate_clubs(guild_id)
                 
-                conn.commit()
                 logger.info(f"All data reset for guild {guild_id}")
                 
-        except Exception as e:
-            logger.error(f"Error resetting all data: {e}")
+        except Exception:
+            logger.exception("Error resetting data for guild %s", guild_id)
             raise
     
     def close(self):
-        """Close database connection (if needed)"""
-        # SQLite connections are closed automatically when using context managers
-        pass
+        """Close the shared database connection"""
+        with self._lock:
+            self._conn.close()
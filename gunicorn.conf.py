@@ -0,0 +1,36 @@
+"""
+Gunicorn settings for the Football Club Bot web server (main:app)
+Gunicorn reads this file from the working directory on startup
+"""
+
+import fcntl
+import threading
+
+# Lock held by the worker running the Discord bot; the OS releases it when
+# that worker exits, and a waiting worker takes over the bot
+BOT_LOCK_PATH = "bot.lock"
+_bot_lock = None
+
+def _run_bot_when_locked():
+    """Wait for the bot lock, then start the Discord bot in this worker"""
+    global _bot_lock
+    lock = open(BOT_LOCK_PATH, "w")
+    fcntl.flock(lock, fcntl.LOCK_EX)  # Blocks while another worker runs the bot
+    _bot_lock = lock
+    
+    import main
+    main.start_bot_thread()
+
+def post_fork(server, worker):
+    """Start the Discord bot in exactly one worker
+    
+    The bot and its SQLite connection are created here, after the fork,
+    rather than in the master: a connection must not be shared with forked
+    children, and one worker keeps the process tree to a single gateway
+    session however many workers there are.
+    
+    Every worker waits on the lock in a daemon thread instead of trying it
+    once, so when the bot's worker exits (e.g. a HUP reload, where new
+    workers start before the old ones stop) one of the others picks it up.
+    """
+    threading.Thread(target=_run_bot_when_locked, daemon=True).start()
@@ -4,59 +4,129 @@ Keep-alive system for the Discord Football Club Bot
 Prevents the bot from sleeping on hosting platforms like render.com
 """
 
-import time
-import requests
+import asyncio
+import aiohttp
 import logging
-import threading
-from datetime import datetime
+import random
+import time
 import os
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
-def ping_self():
-    """Ping the web server to keep it alive"""
+# Pings are skipped when the web server has served a request this recently
+ACTIVITY_WINDOW = 240
+
+# Monotonic time of the last request the web server handled
+last_activity = time.monotonic()
+
+def touch():
+    """Record inbound web traffic, which already keeps the host awake"""
+    global last_activity
+    last_activity = time.monotonic()
+
+# The public URL doesn't change while the process runs, so build the ping
+# target once; without one there is nothing external to ping
+_EXTERNAL_URL = os.getenv('RENDER_EXTERNAL_URL')
+_PING_URL = f"{_EXTERNAL_URL.rstrip('/')}/health" if _EXTERNAL_URL else None
+
+# Whether the last ping succeeded; only changes of state are logged
+_last_ping_ok = True
+
+# Shared session so pings reuse one kept-alive connection (and TLS session)
+_session: Optional[aiohttp.ClientSession] = None
+
+def _get_session() -> aiohttp.ClientSession:
+    """Return the shared ping session, creating it on first use"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            # Pings are minutes apart, well past aiohttp's 10s default DNS TTL,
+            # so keep the resolved address for an hour
+            connector=aiohttp.TCPConnector(keepalive_timeout=600, ttl_dns_cache=3600),
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+    return _session
+
+async def close_session():
+    """Close the shared ping session"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+async def ping_self() -> bool:
+    """Ping the web server to keep it alive; returns False if the ping failed"""
+    global _last_ping_ok
+    # The server runs in this process, so a request to localhost proves
+    # nothing; only the public URL needs hitting to keep the host awake
+    if not _PING_URL:
+        return True
+    
     try:
-        # Get the URL from environment or default to localhost
-        base_url = os.getenv('RENDER_EXTERNAL_URL', 'http://localhost:5000')
-        
-        response = requests.get(f"{base_url}/health", timeout=30)
-        if response.status_code == 200:
-            logger.info(f"Keep-alive ping successful at {datetime.now()}")
-        else:
-            logger.warning(f"Keep-alive ping returned status {response.status_code}")
+        async with _get_session().get(_PING_URL) as response:
+            # Drain the body so the connection goes back to the pool
+            await response.read()
+            if response.status == 200:
+                if not _last_ping_ok:
+                    logger.info("Keep-alive ping recovered")
+                _last_ping_ok = True
+            else:
+                logger.warning(f"Keep-alive ping returned status {response.status}")
+                _last_ping_ok = False
             
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         logger.warning(f"Keep-alive ping failed: {e}")
+        _last_ping_ok = False
     except Exception as e:
         logger.error(f"Unexpected error in keep-alive: {e}")
+        _last_ping_ok = False
+    
+    return _last_ping_ok
+
+def _ping_interval() -> float:
+    """About 5 minutes between pings to avoid rate limiting; the jitter keeps
+    scaled-out instances from pinging in lockstep"""
+    return 300 + random.uniform(-30, 30)
 
-def keep_alive():
+async def keep_alive():
     """Main keep-alive loop"""
     logger.info("Keep-alive system started")
     
-    while True:
-        try:
-            # Wait 5 minutes between pings to avoid rate limiting
-            time.sleep(300)  # 5 minutes
+    delay = _ping_interval()
+    retry_delay = 1.0
+    
+    try:
+        while True:
+            await asyncio.sleep(delay)
             
-            # Ping the server
-            ping_self()
+            # Recent traffic already counts as activity, so don't add to it
+            if time.monotonic() - last_activity < ACTIVITY_WINDOW:
+                delay = _ping_interval()
+                retry_delay = 1.0
+                continue
             
-        except KeyboardInterrupt:
-            logger.info("Keep-alive system stopped")
-            break
-        except Exception as e:
-            logger.error(f"Error in keep-alive loop: {e}")
-            # Continue running even if there's an error
-            time.sleep(60)  # Wait 1 minute before retrying
-
-def start_keep_alive():
-    """Start keep-alive in a separate thread"""
-    thread = threading.Thread(target=keep_alive, daemon=True)
-    thread.start()
-    logger.info("Keep-alive thread started")
-    return thread
+            # Ping the server
+            if await ping_self():
+                delay = _ping_interval()
+                retry_delay = 1.0
+            else:
+                # Failures are usually a cold start or a transient 502, so
+                # retry quickly and back off towards the normal interval
+                delay = retry_delay + random.random()
+                retry_delay = min(retry_delay * 2, 300)
+    finally:
+        await close_session()
+
+def start_keep_alive() -> asyncio.Task:
+    """Start keep-alive as a task on the running event loop"""
+    task = asyncio.get_running_loop().create_task(keep_alive())
+    logger.info("Keep-alive task scheduled")
+    return task
 
 if __name__ == "__main__":
     # For testing
-    keep_alive()
+    try:
+        asyncio.run(keep_alive())
+    except KeyboardInterrupt:
+        logger.info("Keep-alive system stopped")
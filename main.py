@@ -5,70 +5,140 @@ Starts both the bot and the web server with keep-alive functionality
 """
 
 import os
+import queue
+import atexit
 import asyncio
 import threading
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from werkzeug.serving import make_server
 from bot import start_bot
 from web_server import create_app
-from keep_alive import keep_alive
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bot.log'),
-        logging.StreamHandler()
-    ]
-)
+from keep_alive import start_keep_alive
+
+try:
+    import uvloop  # Optional faster event loop; falls back to asyncio's default
+except ImportError:
+    uvloop = None
+
+# Configure logging; records are queued and written by a listener thread so
+# the bot, web server and keep-alive never block on file or console I/O
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler('bot.log'),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+log_listener = None
+
+def _start_log_listener():
+    """Route root logging through a fresh queue and listener thread"""
+    global log_listener
+    log_queue = queue.Queue(-1)
+    for handler in [h for h in _root_logger.handlers if isinstance(h, QueueHandler)]:
+        _root_logger.removeHandler(handler)
+    _root_logger.addHandler(QueueHandler(log_queue))
+    log_listener = QueueListener(log_queue, *_log_handlers)
+    log_listener.start()
+
+def _stop_log_listener():
+    """Flush queued records and stop the listener thread"""
+    if log_listener is not None:
+        log_listener.stop()
+
+_start_log_listener()
+atexit.register(_stop_log_listener)
+
+# A forked child (a gunicorn --preload worker) doesn't inherit the listener
+# thread, so it needs its own or its records would sit in the queue forever
+os.register_at_fork(after_in_child=_start_log_listener)
 
 logger = logging.getLogger(__name__)
 
-# Create Flask app for gunicorn
+# Create Flask app for gunicorn. It can be run with --preload: the app and
+# its pre-rendered pages are then built once in the master and shared by the
+# workers copy-on-write. Importing this module opens no SQLite connection and
+# starts no bot, so nothing that must not cross fork() exists yet;
+# gunicorn.conf.py starts the bot in a single worker after the fork
 app = create_app()
 
+def run_event_loop(coro):
+    """Run a coroutine to completion, on uvloop when it is installed"""
+    loop_factory = uvloop.new_event_loop if uvloop else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        return runner.run(coro)
+
+async def run_bot_services():
+    """Run the Discord bot with keep-alive scheduled on the same event loop"""
+    keep_alive_task = start_keep_alive()
+    try:
+        await start_bot()
+    finally:
+        keep_alive_task.cancel()
+
 def run_discord_bot():
     """Run the Discord bot in a separate thread"""
     try:
-        asyncio.run(start_bot())
+        run_event_loop(run_bot_services())
     except Exception as e:
         logger.error(f"Discord bot error: {e}")
 
-# Start background services when module is imported
-if os.getenv('DISCORD_TOKEN'):  # Only start if token is available
-    # Start Discord bot in a separate thread
+# Set once the bot has been started, so the process holds one gateway session
+_bot_started = False
+
+def claim_bot_start() -> bool:
+    """Return True for the first caller only; later callers must not start the bot"""
+    global _bot_started
+    if _bot_started:
+        return False
+    _bot_started = True
+    return True
+
+def start_bot_thread():
+    """Start the Discord bot in a background thread of this process
+    
+    Called by gunicorn.conf.py in the worker chosen to run the bot; direct
+    execution starts the bot itself in main().
+    """
+    if not os.getenv('DISCORD_TOKEN') or not claim_bot_start():
+        return
+    
     bot_thread = threading.Thread(target=run_discord_bot, daemon=True)
     bot_thread.start()
     logger.info("Discord bot started in background")
-    
-    # Start keep-alive system
-    keep_alive_thread = threading.Thread(target=keep_alive, daemon=True)
-    keep_alive_thread.start()
-    logger.info("Keep-alive system started")
 
 async def main():
     """Main function for direct execution"""
     logger.info("Starting Football Club Management Bot...")
     
-    # Start web server in a separate thread
-    def run_web_server():
-        app.run(host='0.0.0.0', port=5000, debug=False, use_reloader=False)
+    # Start web server in a separate thread. Each request gets its own thread,
+    # so one idle or slow client can't hold up health checks behind it
+    web_server = make_server('0.0.0.0', 5000, app, threaded=True)
     
-    web_thread = threading.Thread(target=run_web_server, daemon=True)
+    # serve_forever wakes every poll_interval only to check for shutdown();
+    # the daemon thread just dies with the process, so let it sleep in select
+    web_thread = threading.Thread(
+        target=web_server.serve_forever,
+        kwargs={'poll_interval': 3600},
+        daemon=True
+    )
     web_thread.start()
     logger.info("Web server started on port 5000")
     
-    # Start keep-alive system
-    keep_alive_thread = threading.Thread(target=keep_alive, daemon=True)
-    keep_alive_thread.start()
-    logger.info("Keep-alive system started")
+    if not claim_bot_start():
+        logger.warning("Discord bot already running in this process")
+        return
     
-    # Start the Discord bot
-    await start_bot()
+    # Start the Discord bot, with keep-alive on its event loop
+    await run_bot_services()
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run_event_loop(main())
     except KeyboardInterrupt:
         logger.info("Bot shutdown requested")
     except Exception as e:
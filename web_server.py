@@ -4,83 +4,163 @@ Simple web server for the Discord Football Club Bot
 Provides keep-alive functionality and basic status page
 """
 
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, render_template, request
 import os
+import json
+import time
 import logging
-from datetime import datetime
-from database import Database
+from datetime import datetime, timezone
+from typing import Callable, Dict, Tuple
+import keep_alive
+
+try:
+    import orjson  # Optional faster encoder that returns bytes directly
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+def _dumps(obj) -> bytes:
+    """Serialize obj to JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+# Serialized JSON bodies for the polled endpoints, reused for a short TTL
+_CACHE_TTL = 1.0
+_cache: Dict[str, Tuple[float, bytes]] = {}
+
+# /api/status never changes apart from its timestamp, so serialize it once
+_STATUS_TEMPLATE = _dumps({
+    'bot_status': 'online',
+    'database_status': 'connected',
+    'timestamp': '%s',
+    'features': [
+        'Club Management',
+        'Player Management',
+        'Match Scheduling',
+        'Transfer System',
+        'Statistics',
+        'Rate Limiting Protection'
+    ]
+})
+
+# (epoch second, ISO string) for the last timestamp handed out
+_ts_cache = [0, ""]
+
+def _iso_now() -> str:
+    """Current UTC time as an ISO string, formatted once per second"""
+    second = int(time.time())
+    if second != _ts_cache[0]:
+        _ts_cache[:] = [second, datetime.fromtimestamp(second, timezone.utc).isoformat()]
+    return _ts_cache[1]
+
+def _cached_body(key: str, build: Callable[[], Dict]) -> bytes:
+    """Return a serialized JSON body, rebuilding it at most once per TTL"""
+    now = time.monotonic()
+    entry = _cache.get(key)
+    if entry is None or now - entry[0] >= _CACHE_TTL:
+        entry = (now, _dumps(build()))
+        _cache[key] = entry
+    return entry[1]
+
+def _health_payload() -> Dict:
+    return {
+        'status': 'healthy',
+        'timestamp': _iso_now(),
+        'service': 'football-bot'
+    }
+
 def create_app():
     """Create and configure the Flask application"""
     app = Flask(__name__)
     app.secret_key = os.environ.get("SESSION_SECRET", "default_secret_key_change_me")
     
-    # Initialize database
-    db = Database()
+    @app.before_request
+    def record_activity():
+        """Let keep-alive know the host is already seeing traffic"""
+        # The platform probes /health every few seconds, and keep-alive's own
+        # ping lands there too; neither is real traffic
+        if request.path != '/health':
+            keep_alive.touch()
+    
+    # Compile the status page once; its output only changes once a second
+    index_template = app.jinja_env.get_template('index.html')
+    index_page = ['', '']  # [uptime, rendered html]
+    
+    # Error pages never change, so render them once; url_for needs a request
+    # context, which a test context provides outside of any real request
+    with app.test_request_context():
+        not_found_page = index_template.render(
+            stats={'status': 'Page Not Found', 'uptime': 'N/A', 'version': '1.0.0'}
+        ).encode()
+        internal_error_page = index_template.render(
+            stats={'status': 'Internal Error', 'uptime': 'N/A', 'version': '1.0.0'}
+        ).encode()
     
     @app.route('/')
     def index():
         """Main status page"""
         try:
-            # Get basic statistics
-            stats = {
-                'status': 'Online',
-                'uptime': datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
-                'version': '1.0.0'
-            }
+            uptime = datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
+            if index_page[0] != uptime:
+                # Get basic statistics
+                stats = {
+                    'status': 'Online',
+                    'uptime': uptime,
+                    'version': '1.0.0'
+                }
+                index_page[:] = [uptime, index_template.render(stats=stats)]
             
-            return render_template('index.html', stats=stats)
+            return index_page[1]
         except Exception as e:
             logger.error(f"Error in index route: {e}")
             return render_template('index.html', stats={'status': 'Error', 'uptime': 'Unknown', 'version': '1.0.0'})
     
     @app.route('/health')
     def health():
-        """Health check endpoint"""
-        return jsonify({
-            'status': 'healthy',
-            'timestamp': datetime.now().isoformat(),
-            'service': 'football-bot'
-        })
+        """Health check endpoint; GET and HEAD are answered by wsgi_app below"""
+        return Response(_cached_body('health', _health_payload), mimetype='application/json')
     
     @app.route('/api/status')
     def api_status():
         """API status endpoint"""
         try:
-            return jsonify({
-                'bot_status': 'online',
-                'database_status': 'connected',
-                'timestamp': datetime.now().isoformat(),
-                'features': [
-                    'Club Management',
-                    'Player Management', 
-                    'Match Scheduling',
-                    'Transfer System',
-                    'Statistics',
-                    'Rate Limiting Protection'
-                ]
-            })
+            return Response(_STATUS_TEMPLATE % _iso_now().encode(), mimetype='application/json')
         except Exception as e:
             logger.error(f"Error in status API: {e}")
-            return jsonify({
+            return Response(_dumps({
                 'bot_status': 'error',
                 'database_status': 'error',
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': _iso_now(),
                 'error': str(e)
-            }), 500
+            }), status=500, mimetype='application/json')
     
     @app.errorhandler(404)
     def not_found(error):
         """Handle 404 errors"""
-        return render_template('index.html', stats={'status': 'Page Not Found', 'uptime': 'N/A', 'version': '1.0.0'}), 404
+        return Response(not_found_page, status=404, mimetype='text/html')
     
     @app.errorhandler(500)
     def internal_error(error):
         """Handle 500 errors"""
         logger.error(f"Internal server error: {error}")
-        return render_template('index.html', stats={'status': 'Internal Error', 'uptime': 'N/A', 'version': '1.0.0'}), 500
+        return Response(internal_error_page, status=500, mimetype='text/html')
+    
+    flask_wsgi_app = app.wsgi_app
+    
+    def wsgi_app(environ, start_response):
+        """Answer health probes before Flask builds a request context"""
+        if environ.get('PATH_INFO') == '/health' and environ.get('REQUEST_METHOD') in ('GET', 'HEAD'):
+            body = _cached_body('health', _health_payload)
+            start_response('200 OK', [
+                ('Content-Type', 'application/json'),
+                ('Content-Length', str(len(body)))
+            ])
+            return [body]
+        return flask_wsgi_app(environ, start_response)
+    
+    app.wsgi_app = wsgi_app
     
     return app
 